@@ -13,28 +13,133 @@ Options:
   -c, --color           Use colored output (looks better in most terminals)
   -p, --plain           Use plain output (no colors or formatting)
   -v, --verbose         Show more detailed information in results
+  -r, --repl            Keep the model loaded and read queries interactively
 """
 
 import sys
 import os
+
+# Size the OpenMP/MKL pools to the machine before torch is imported; set
+# OMP_NUM_THREADS / MKL_NUM_THREADS in the environment to override
+def _env_threads() -> int:
+    # OMP_NUM_THREADS may list one count per nesting level, e.g. "4,2"
+    try:
+        threads = int(os.environ.get("OMP_NUM_THREADS", "").split(",")[0])
+    except ValueError:
+        threads = 0
+    return threads if threads > 0 else (os.cpu_count() or 4)
+
+
+NUM_THREADS = _env_threads()
+os.environ.setdefault("OMP_NUM_THREADS", str(NUM_THREADS))
+os.environ.setdefault("MKL_NUM_THREADS", str(NUM_THREADS))
+
+import json
+import base64
 import textwrap
 import argparse
-from typing import List, Dict, Any, Optional
-
-try:
-    import numpy as np
-    from sentence_transformers import SentenceTransformer
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import Filter, FieldCondition, MatchValue
-except ImportError:
+import concurrent.futures
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Iterator
+
+# Heavy dependencies are imported on first use so that --help, --list and
+# --details do not pay for loading torch and sentence-transformers
+np = None
+torch = None
+SentenceTransformer = None
+ONNX_AVAILABLE = False
+
+
+def _missing_packages() -> None:
     print("Required packages not found. Please install them using:")
     print("pip install qdrant-client sentence-transformers numpy")
     sys.exit(1)
 
+
+def _import_qdrant() -> None:
+    """Import the Qdrant client, needed by every command"""
+    global QdrantClient, Filter, FieldCondition, MatchValue, QueryRequest, PayloadSelectorInclude
+    global HasIdCondition, OrderBy, Direction
+    try:
+        from qdrant_client import QdrantClient
+        from qdrant_client.models import Filter, FieldCondition, MatchValue, QueryRequest, PayloadSelectorInclude
+        from qdrant_client.models import HasIdCondition, OrderBy, Direction
+    except ImportError:
+        _missing_packages()
+
+
+def _import_numpy() -> None:
+    """Import numpy, which is much cheaper to load than the embedding stack"""
+    global np
+    try:
+        import numpy as np
+    except ImportError:
+        _missing_packages()
+
+
+def _import_model() -> None:
+    """Import the embedding stack, needed only for searching"""
+    global torch, SentenceTransformer
+    global ONNX_AVAILABLE, ort, AutoTokenizer, ORTModelForFeatureExtraction, ORTQuantizer, AutoQuantizationConfig
+    if torch is not None:
+        return
+    _import_numpy()
+    try:
+        import torch
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        _missing_packages()
+
+    # Use every core for the encoder matmuls; one inter-op thread avoids
+    # oversubscription since a single query is a single op graph. torch only
+    # accepts the inter-op setting before any parallel work, so set it once here
+    torch.set_num_threads(NUM_THREADS)
+    torch.set_num_interop_threads(1)
+
+    # ONNX Runtime is optional; without it the PyTorch model is used
+    try:
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        ONNX_AVAILABLE = True
+    except ImportError:
+        ONNX_AVAILABLE = False
+
 # Define constants
 COLLECTION_NAME = "legislation_embeddings"
 MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Semantic query cache: queries whose embeddings have cosine similarity at or
+# above the threshold with a cached query reuse that query's results
+QUERY_CACHE_SIZE = 256
+QUERY_CACHE_THRESHOLD = 0.97
+
+# Query embeddings persisted between runs, stored as base64 float32 bytes
+QUERY_EMBEDDING_CACHE = os.environ.get(
+    "QUERY_EMBEDDING_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "legislation_search", "query_embeddings.json")
+)
+
+# Points fetched per scroll request
+SCROLL_PAGE_SIZE = 1024
+
+# Where the PyTorch model is downloaded to; its safetensors weights are
+# memory-mapped from here, so concurrent processes share the page cache
+MODEL_CACHE_DIR = os.environ.get(
+    "MODEL_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "legislation_search", "st")
+)
+
+# Where the exported int8 ONNX model is kept between runs
+ONNX_MODEL_DIR = os.environ.get(
+    "ONNX_MODEL_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "legislation_search", "onnx")
+)
+
+# Shared wrapper for result and section text, built once instead of per call
+_WRAPPER = textwrap.TextWrapper(width=80)
+
 # ANSI color codes (for nice terminal output)
 class Colors:
     HEADER = '\033[95m'
@@ -50,18 +155,117 @@ class Colors:
 # Global flag for colored output
 use_colors = True
 
-def c(text, color):
-    """Apply color to text if colors are enabled"""
-    if use_colors:
-        return f"{color}{text}{Colors.ENDC}"
+_ENDC = Colors.ENDC
+
+def _colored(text, color):
+    """Apply color to text"""
+    return f"{color}{text}{_ENDC}"
+
+def _plain(text, color):
+    """Return text unchanged"""
     return text
 
+# Color function, bound once by set_colors() rather than checking the flag per call
+c = _colored
+
+def set_colors(enabled: bool) -> None:
+    """Enable or disable colored output"""
+    global c, use_colors
+    use_colors = enabled
+    c = _colored if enabled else _plain
+
+class ORTEmbedder:
+    """
+    Int8-quantized ONNX Runtime replacement for the SentenceTransformer encoder.
+
+    Exposes the subset of the SentenceTransformer API used by this tool.
+    Embeddings are mean-pooled and L2-normalized like all-MiniLM-L6-v2.
+    """
+
+    QUANTIZED_FILE = "model_quantized.onnx"
+
+    def __init__(self, model_name: str, cache_dir: str, max_seq_length: int = 256):
+        """Load the quantized model, exporting and quantizing it on first use"""
+        self.max_seq_length = max_seq_length
+        quantized_dir = os.path.join(cache_dir, "quantized")
+        model_path = os.path.join(quantized_dir, self.QUANTIZED_FILE)
+
+        if not os.path.exists(model_path):
+            print("Exporting embedding model to ONNX (first run only)...")
+            export_dir = os.path.join(cache_dir, "exported")
+            ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+            quantizer = ORTQuantizer.from_pretrained(export_dir)
+            quantizer.quantize(
+                save_dir=quantized_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False),
+            )
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(quantized_dir)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(quantized_dir)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = NUM_THREADS
+        self.session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self._dim = self.session.get_outputs()[0].shape[-1]
+        if not isinstance(self._dim, int):
+            # Dynamic output shape; probe with a tiny input
+            tokens = self.tokenizer(["probe"], return_tensors="np")
+            self._dim = self.session.run(None, {k: v for k, v in tokens.items() if k in self._input_names})[0].shape[-1]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dim
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> "np.ndarray":
+        """Encode a string or list of strings into normalized embeddings"""
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+
+        # Encode longest-first so each batch pads to similar lengths
+        order = sorted(range(len(sentences)), key=lambda i: -len(sentences[i]))
+        embeddings = np.empty((len(sentences), self._dim), dtype=np.float32)
+
+        for start in range(0, len(order), batch_size):
+            idx = order[start:start + batch_size]
+            tokens = self.tokenizer(
+                [sentences[i] for i in idx],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            inputs = {k: v for k, v in tokens.items() if k in self._input_names}
+            hidden = self.session.run(None, inputs)[0]
+
+            # Mean pooling over non-padding tokens
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            embeddings[idx] = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+        return embeddings[0] if single else embeddings
+
+
 class LegislationSearch:
-    def __init__(self, qdrant_host: str = "localhost", qdrant_port: int = 6333):
-        """Initialize the legislation search tool"""
-        self.client = QdrantClient(host=qdrant_host, port=qdrant_port)
-        print(f"Loading embedding model {MODEL_NAME}...")
-        self.model = SentenceTransformer(MODEL_NAME)
+    def __init__(self, qdrant_host: str = "localhost", qdrant_port: int = 6333, qdrant_grpc_port: int = 6334,
+                 load_model: bool = True):
+        """Initialize the legislation search tool; load_model=False skips the encoder for list/details"""
+        _import_qdrant()
+
+        # gRPC sends vectors as packed floats rather than JSON
+        self.client = QdrantClient(
+            host=qdrant_host,
+            port=qdrant_port,
+            grpc_port=qdrant_grpc_port,
+            prefer_grpc=True,
+            timeout=30,
+        )
+
+        self.model = None
+        if load_model:
+            _import_model()
+
+            print(f"Loading embedding model {MODEL_NAME}...")
+            self.model = self._load_model()
         print("Connecting to vector database...")
         
         try:
@@ -71,60 +275,234 @@ class LegislationSearch:
             print(f"Error connecting to Qdrant: {e}")
             sys.exit(1)
 
-    def search(self, query: str, limit: int = 4, verbose: bool = False) -> None:
-        """Search for legislation matching the query"""
-        print(f"Searching for: {c(query, Colors.YELLOW)}")
-        
-        # Generate embedding for the query
-        query_embedding = self.model.encode(query)
-        
-        # Normalize the vector
-        query_embedding = query_embedding / np.linalg.norm(query_embedding)
-        
+        # legislation_id -> title, filled by full scans and single lookups
+        self._titles: Dict[str, str] = {}
+        self._titles_complete = False
+
+        # A small collection fits in one scroll page, so load every title up front
+        if (collection_info.points_count or 0) <= SCROLL_PAGE_SIZE:
+            self._load_titles()
+
+        if self.model is None:
+            return
+
+        # Embedding dimension is fixed for the model, look it up once
+        self._dim = self.model.get_sentence_embedding_dimension()
+
+        # Query cache: rows of _qcache_vecs are normalized query embeddings,
+        # _qcache_keys/_qcache_results hold the query text and (limit, results)
+        # for the same row, and _qcache_lru maps query text -> row in LRU order
+        self._qcache_vecs = np.empty((16, self._dim), dtype=np.float32)
+        self._qcache_keys: List[str] = []
+        self._qcache_results: List[Any] = []
+        self._qcache_lru: "OrderedDict[str, int]" = OrderedDict()
+
+        # Persistent query text -> embedding cache, so repeated queries skip the encoder.
+        # It is written back once, by close(), and only if it changed
+        self._embedding_cache = self._load_embedding_cache()
+        self._embedding_cache_dirty = False
+
+    def _load_embedding_cache(self) -> Dict[str, Any]:
+        """Load persisted query embeddings, ignoring entries from another model"""
+        try:
+            with open(QUERY_EMBEDDING_CACHE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get('model') != MODEL_NAME or data.get('dim') != self._dim:
+            return {}
+
+        recent = list(data.get('embeddings', {}).items())[-QUERY_CACHE_SIZE:]
+        return {
+            query: np.frombuffer(base64.b64decode(encoded), dtype=np.float32)
+            for query, encoded in recent
+        }
+
+    def _save_embedding_cache(self) -> None:
+        """Persist the query embeddings as base64 float32 bytes"""
+        data = {
+            'model': MODEL_NAME,
+            'dim': self._dim,
+            'embeddings': {
+                query: base64.b64encode(embedding.astype(np.float32, copy=False).tobytes()).decode('ascii')
+                for query, embedding in self._embedding_cache.items()
+            },
+        }
+        # Write a temporary file and rename it over the cache, so a crash
+        # mid-write leaves the previous cache intact
+        tmp_path = f"{QUERY_EMBEDDING_CACHE}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(QUERY_EMBEDDING_CACHE), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, QUERY_EMBEDDING_CACHE)
+            self._embedding_cache_dirty = False
+        except OSError as e:
+            print(f"Could not save query embedding cache: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _encode_query(self, query: str) -> "np.ndarray":
+        """Return the unit-length float32 embedding for a query, encoding it only once"""
+        embedding = self._embedding_cache.pop(query, None)
+        if embedding is None:
+            embedding = self.model.encode(
+                query, normalize_embeddings=True, convert_to_numpy=True
+            ).astype(np.float32, copy=False)
+            self._embedding_cache[query] = embedding
+            if len(self._embedding_cache) > QUERY_CACHE_SIZE:
+                # Evict the least recently used query
+                del self._embedding_cache[next(iter(self._embedding_cache))]
+            self._embedding_cache_dirty = True
+        else:
+            # Re-insert so the dict stays in least-recently-used order
+            self._embedding_cache[query] = embedding
+        return embedding
+
+    def close(self) -> None:
+        """Save the query embedding cache if it changed and close the Qdrant client"""
+        if self.model is not None and self._embedding_cache_dirty:
+            self._save_embedding_cache()
+        self.client.close()
+
+    def _load_model(self):
+        """Load the int8 ONNX encoder if available, otherwise the PyTorch model"""
+        if ONNX_AVAILABLE and os.environ.get("USE_ONNX", "true").lower() in ('true', 'yes', '1', 'y'):
+            try:
+                return ORTEmbedder(MODEL_NAME, ONNX_MODEL_DIR)
+            except Exception as e:
+                print(f"Could not load ONNX model ({e}), falling back to PyTorch")
+        model = SentenceTransformer(MODEL_NAME, device="cpu", cache_folder=MODEL_CACHE_DIR)
+        model.eval()
+        return model
+
+    def _cached_search(self, query: str, limit: int) -> list:
+        """Run a vector search, reusing results of identical or near-identical queries"""
+        # Exact match skips both the encoder and Qdrant
+        row = self._qcache_lru.get(query)
+        if row is not None and self._qcache_results[row][0] >= limit:
+            self._qcache_lru.move_to_end(query)
+            return self._qcache_results[row][1][:limit]
+
+        # Generate a unit-length embedding for the query
+        query_embedding = self._encode_query(query)
+
+        # Semantic match against all cached queries in one matrix-vector product
+        cached = len(self._qcache_keys)
+        if cached:
+            scores = self._qcache_vecs[:cached] @ query_embedding
+            best = int(np.argmax(scores))
+            if scores[best] >= QUERY_CACHE_THRESHOLD and self._qcache_results[best][0] >= limit:
+                self._qcache_lru.move_to_end(self._qcache_keys[best])
+                return self._qcache_results[best][1][:limit]
+
         # Search
-        results = self.client.search(
+        results = self.client.query_points(
             collection_name=COLLECTION_NAME,
-            query_vector=query_embedding.tolist(),
+            query=query_embedding,
             limit=limit,
             with_payload=True,
-        )
+        ).points
+
+        self._cache_store(query, query_embedding, limit, results)
+        return results
+
+    def _cache_store(self, query: str, query_embedding: "np.ndarray", limit: int, results: list) -> None:
+        """Add a query and its results to the cache, evicting the least recently used entry when full"""
+        row = self._qcache_lru.pop(query, None)
+        if row is None:
+            if len(self._qcache_keys) >= QUERY_CACHE_SIZE:
+                # Reuse the row of the least recently used query
+                _, row = self._qcache_lru.popitem(last=False)
+            else:
+                row = len(self._qcache_keys)
+                if row == len(self._qcache_vecs):
+                    # Double the buffer so appends stay amortized O(1)
+                    grown = np.empty((row * 2, self._qcache_vecs.shape[1]), dtype=np.float32)
+                    grown[:row] = self._qcache_vecs
+                    self._qcache_vecs = grown
+                self._qcache_keys.append(query)
+                self._qcache_results.append(None)
+
+        self._qcache_vecs[row] = query_embedding
+        self._qcache_keys[row] = query
+        self._qcache_results[row] = (limit, results)
+        self._qcache_lru[query] = row
+
+    def search(self, query: str, limit: int = 4, verbose: bool = False) -> None:
+        """Search for legislation matching the query"""
+        print(f"Searching for: {c(query, Colors.YELLOW)}")
         
+        results = self._cached_search(query, limit)
+        self.display_results(results, verbose=verbose)
+
+    def search_batch(self, queries: List[str], limit: int = 4) -> List[list]:
+        """Search for several queries with one encode call and one Qdrant request"""
+        if not queries:
+            return []
+
+        # Encoding a list lets the model batch (and length-sort) the queries
+        embeddings = self.model.encode(
+            queries,
+            batch_size=32,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ).astype(np.float32)
+
+        batch_results = [
+            response.points
+            for response in self.client.query_batch_points(
+                collection_name=COLLECTION_NAME,
+                requests=[
+                    QueryRequest(query=embedding.tolist(), limit=limit, with_payload=True)
+                    for embedding in embeddings
+                ],
+            )
+        ]
+
+        for query, embedding, results in zip(queries, embeddings, batch_results):
+            self._cache_store(query, embedding, limit, results)
+
+        return batch_results
+
+    def display_results(self, results: list, verbose: bool = False) -> None:
+        """Print search results grouped by legislation"""
         if not results:
             print(c("No results found.", Colors.RED))
             return
         
-        # Group results by legislation ID to avoid duplicates
+        # Group results by legislation ID to avoid duplicates. Qdrant returns
+        # results by descending score, so the first hit per ID is the best one
+        # and insertion order is already the display order
         grouped_results = {}
         for result in results:
-            leg_id = result.payload.get('legislation_id')
-            if leg_id not in grouped_results or result.score > grouped_results[leg_id]['score']:
-                grouped_results[leg_id] = {
-                    'score': result.score,
-                    'payload': result.payload,
-                    'point_id': result.id
-                }
+            grouped_results.setdefault(result.payload.get('legislation_id'), result)
         
         # Display results
         print(c(f"\nFound {len(grouped_results)} relevant legislation documents:", Colors.GREEN))
         print("-" * 80)
         
-        for i, (leg_id, result) in enumerate(sorted(grouped_results.items(), 
-                                             key=lambda x: x[1]['score'], 
-                                             reverse=True), 1):
-            score = result['score']
-            payload = result['payload']
+        for i, (leg_id, result) in enumerate(grouped_results.items(), 1):
+            score = result.score
+            payload = result.payload
             
             # Format and display the result
             title = payload.get('section_title', 'Untitled Section')
             
             # Get text and format it nicely
             text = payload.get('text', '')
-            wrapped_text = textwrap.fill(text[:500], width=80)
+            wrapped_text = _WRAPPER.fill(text[:500])
             if len(text) > 500:
                 wrapped_text += "..."
             
             print(c(f"Result {i} - Similarity: {score:.4f}", Colors.BOLD))
             print(c(f"Legislation ID: {leg_id}", Colors.BLUE))
+            legislation_title = self._get_title(leg_id)
+            if legislation_title:
+                print(f"Title: {legislation_title}")
             print(c(f"Section: {title}", Colors.CYAN))
             print(f"\n{wrapped_text}\n")
             
@@ -134,62 +512,109 @@ class LegislationSearch:
                 print(f"  Section Type: {payload.get('section_type', 'N/A')}")
                 print(f"  Section Number: {payload.get('section_number', 'N/A')}")
                 print(f"  Chunk Index: {payload.get('chunk_idx', 'N/A')}")
-                print(f"  Point ID: {result['point_id']}")
+                print(f"  Point ID: {result.id}")
             
             print("-" * 80)
 
-    def list_legislation(self) -> None:
-        """List all legislation documents in the database"""
-        print("Fetching legislation documents...")
+    def _load_titles(self) -> Dict[str, str]:
+        """Load the title of every legislation in a single scroll pass"""
+        if self._titles_complete:
+            return self._titles
         
-        # Get unique legislation IDs
-        legislation_ids = set()
-        offset = None
+        payload_selector = PayloadSelectorInclude(include=["legislation_id", "section_title"])
         
-        while True:
-            batch, offset = self.client.scroll(
+        def fetch_page(offset):
+            return self.client.scroll(
                 collection_name=COLLECTION_NAME,
-                limit=100,
+                limit=SCROLL_PAGE_SIZE,
                 offset=offset,
-                with_payload=["legislation_id", "section_title"],
+                with_payload=payload_selector,
                 with_vectors=False,
             )
-            
-            for point in batch:
-                legislation_ids.add(point.payload.get('legislation_id'))
+        
+        # Request the next page before processing the current one so the
+        # network wait overlaps with aggregation
+        titles = self._titles
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(fetch_page, None)
+            while future is not None:
+                batch, offset = future.result()
+                future = executor.submit(fetch_page, offset) if offset is not None else None
                 
-            if offset is None:
-                break
+                for point in batch:
+                    titles.setdefault(point.payload.get('legislation_id'), point.payload.get('section_title', 'Untitled'))
+        
+        self._titles_complete = True
+        return titles
+    
+    def _get_title(self, legislation_id: str) -> Optional[str]:
+        """Return the title of a legislation, fetching it only on a cache miss"""
+        if legislation_id in self._titles or self._titles_complete:
+            return self._titles.get(legislation_id)
+        
+        batch, _ = self.client.scroll(
+            collection_name=COLLECTION_NAME,
+            scroll_filter=Filter(
+                must=[FieldCondition(key="legislation_id", match=MatchValue(value=legislation_id))]
+            ),
+            limit=1,
+            with_payload=PayloadSelectorInclude(include=["section_title"]),
+            with_vectors=False,
+        )
+        if not batch:
+            return None
+        return self._titles.setdefault(legislation_id, batch[0].payload.get('section_title', 'Untitled'))
+    
+    def list_legislation(self) -> None:
+        """List all legislation documents in the database"""
+        print("Fetching legislation documents...")
         
-        if not legislation_ids:
+        titles = self._load_titles()
+        
+        if not titles:
             print(c("No legislation documents found.", Colors.RED))
             return
         
-        print(c(f"\nFound {len(legislation_ids)} legislation documents:", Colors.GREEN))
+        print(c(f"\nFound {len(titles)} legislation documents:", Colors.GREEN))
         print("-" * 80)
         
-        # Get more details about each legislation
-        for i, leg_id in enumerate(sorted(legislation_ids), 1):
-            # Get first point for this legislation
-            results = self.client.search(
+        for i, leg_id in enumerate(sorted(titles), 1):
+            print(c(f"{i}. {leg_id}", Colors.BLUE))
+            print(f"   Title: {titles[leg_id]}")
+            print()
+
+    def _scroll_all(self, filter_: "Filter", order_key: str) -> Iterator[Any]:
+        """Yield every point matching the filter in ascending order of an indexed integer payload key"""
+        # Qdrant does not paginate ordered scrolls with an offset, so each page
+        # starts from the last key seen and excludes points already yielded at it
+        start_from = None
+        seen_at_start: List[Any] = []
+        
+        while True:
+            must_not = list(filter_.must_not or [])
+            if seen_at_start:
+                must_not.append(HasIdCondition(has_id=seen_at_start))
+            
+            batch, _ = self.client.scroll(
                 collection_name=COLLECTION_NAME,
-                query_vector=[0] * self.model.get_sentence_embedding_dimension(),  # Dummy vector
-                limit=1,
+                scroll_filter=Filter(must=filter_.must, should=filter_.should, must_not=must_not),
+                limit=SCROLL_PAGE_SIZE,
+                order_by=OrderBy(key=order_key, direction=Direction.ASC, start_from=start_from),
                 with_payload=True,
-                filter=Filter(
-                    must=[FieldCondition(key="legislation_id", match=MatchValue(value=leg_id))]
-                )
+                with_vectors=False,
             )
             
-            if results:
-                title = results[0].payload.get('section_title', 'Untitled')
-                print(c(f"{i}. {leg_id}", Colors.BLUE))
-                print(f"   Title: {title}")
-                print()
-            else:
-                print(c(f"{i}. {leg_id}", Colors.BLUE))
-                print()
-
+            yield from batch
+            
+            if len(batch) < SCROLL_PAGE_SIZE:
+                return
+            
+            last = batch[-1].payload.get(order_key)
+            if last != start_from:
+                seen_at_start = []
+            start_from = last
+            seen_at_start.extend(p.id for p in batch if p.payload.get(order_key) == last)
+    
     def show_legislation_details(self, legislation_id: str) -> None:
         """Show details for a specific legislation"""
         print(f"Fetching details for legislation: {c(legislation_id, Colors.BLUE)}")
@@ -199,44 +624,41 @@ class LegislationSearch:
             must=[FieldCondition(key="legislation_id", match=MatchValue(value=legislation_id))]
         )
         
-        points = self.client.scroll(
-            collection_name=COLLECTION_NAME,
-            filter=filter_condition,
-            limit=100,
-            with_payload=True,
-            with_vectors=False,
-        )
+        points = list(self._scroll_all(filter_condition, order_key="section_idx"))
         
-        batch, _ = points
-        
-        if not batch:
+        if not points:
             print(c(f"No data found for legislation ID: {legislation_id}", Colors.RED))
             return
         
-        print(c(f"\nFound {len(batch)} sections/chunks for legislation {legislation_id}:", Colors.GREEN))
+        print(c(f"\nFound {len(points)} sections/chunks for legislation {legislation_id}:", Colors.GREEN))
         print("-" * 80)
         
-        # Group by section
+        # Order by (section_idx, chunk_idx) with one vectorized sort; the scroll
+        # already returns sections in order, so this mostly orders the chunks
+        _import_numpy()
+        section_keys = np.fromiter((p.payload.get('section_idx', 0) for p in points), dtype=np.int64, count=len(points))
+        chunk_keys = np.fromiter((p.payload.get('chunk_idx', 0) for p in points), dtype=np.int64, count=len(points))
+        order = np.lexsort((chunk_keys, section_keys))
+        
+        # Group by section, visiting points in sorted order so both sections
+        # and chunks are appended in display order
         sections = {}
-        for point in batch:
-            section_idx = point.payload.get('section_idx', 0)
+        for i in order.tolist():
+            payload = points[i].payload
+            section_idx = int(section_keys[i])
             
             if section_idx not in sections:
                 sections[section_idx] = {
-                    'title': point.payload.get('section_title', 'Untitled Section'),
-                    'section_type': point.payload.get('section_type', ''),
-                    'section_number': point.payload.get('section_number', ''),
+                    'title': payload.get('section_title', 'Untitled Section'),
+                    'section_type': payload.get('section_type', ''),
+                    'section_number': payload.get('section_number', ''),
                     'chunks': []
                 }
             
-            sections[section_idx]['chunks'].append({
-                'chunk_idx': point.payload.get('chunk_idx', 0),
-                'text': point.payload.get('text', ''),
-                'point_id': point.id
-            })
+            sections[section_idx]['chunks'].append(payload.get('text', ''))
         
         # Display sections and chunks
-        for section_idx, section_data in sorted(sections.items()):
+        for section_idx, section_data in sections.items():
             print(c(f"Section {section_idx}: {section_data['title']}", Colors.BOLD + Colors.CYAN))
             if section_data['section_type']:
                 print(f"Type: {section_data['section_type']}")
@@ -246,19 +668,37 @@ class LegislationSearch:
             print(c(f"Chunks: {len(section_data['chunks'])}", Colors.YELLOW))
             
             # Show text from all chunks in the section
-            all_text = '\n'.join([chunk['text'] for chunk in sorted(
-                section_data['chunks'], 
-                key=lambda x: x['chunk_idx']
-            )])
+            all_text = '\n'.join(section_data['chunks'])
             
-            print("\n" + textwrap.fill(all_text, width=80) + "\n")
+            print("\n" + _WRAPPER.fill(all_text) + "\n")
             print("-" * 80)
 
 
+def run_repl(search_tool: LegislationSearch, limit: int = 4, verbose: bool = False) -> None:
+    """Read queries from stdin until EOF or 'quit', reusing the loaded model and client"""
+    print(c("Enter a query, ':list', ':details ID' or 'quit'.", Colors.GREEN))
+    while True:
+        try:
+            line = input("query> ").strip()
+        except EOFError:
+            print()
+            return
+        
+        if not line:
+            continue
+        if line in ('quit', 'exit', ':q'):
+            return
+        
+        if line == ':list':
+            search_tool.list_legislation()
+        elif line.startswith(':details '):
+            search_tool.show_legislation_details(line[len(':details '):].strip())
+        else:
+            search_tool.search(line, limit=limit, verbose=verbose)
+
+
 def main():
     """Main CLI entrypoint"""
-    global use_colors
-    
     parser = argparse.ArgumentParser(
         description="Legislation Search CLI - Search legislation documents using semantic similarity"
     )
@@ -269,29 +709,41 @@ def main():
     parser.add_argument("-c", "--color", action="store_true", help="Use colored output (default)")
     parser.add_argument("-p", "--plain", action="store_true", help="Use plain output (no colors)")
     parser.add_argument("-v", "--verbose", action="store_true", help="Show more detailed information in results")
+    parser.add_argument("-r", "--repl", action="store_true", help="Keep the model loaded and read queries interactively")
     
     args = parser.parse_args()
     
     # Handle color options
-    if args.plain:
-        use_colors = False
+    set_colors(not args.plain)
     
     # Set environment variables for the Qdrant connection
     qdrant_host = os.environ.get("QDRANT_HOST", "localhost")
     qdrant_port = int(os.environ.get("QDRANT_PORT", "6333"))
+    qdrant_grpc_port = int(os.environ.get("QDRANT_GRPC_PORT", "6334"))
+    
+    if not (args.list or args.details or args.query or args.repl):
+        parser.print_help()
+        return
     
     # Initialize search tool
-    search_tool = LegislationSearch(qdrant_host, qdrant_port)
+    search_tool = LegislationSearch(
+        qdrant_host, qdrant_port, qdrant_grpc_port,
+        load_model=args.repl or not (args.list or args.details)
+    )
     
     # Execute the requested command
-    if args.list:
-        search_tool.list_legislation()
-    elif args.details:
-        search_tool.show_legislation_details(args.details)
-    elif args.query:
-        search_tool.search(args.query, limit=args.num_results, verbose=args.verbose)
-    else:
-        parser.print_help()
+    try:
+        if args.list:
+            search_tool.list_legislation()
+        elif args.details:
+            search_tool.show_legislation_details(args.details)
+        elif args.query:
+            search_tool.search(args.query, limit=args.num_results, verbose=args.verbose)
+        
+        if args.repl:
+            run_repl(search_tool, limit=args.num_results, verbose=args.verbose)
+    finally:
+        search_tool.close()
 
 
 if __name__ == "__main__":
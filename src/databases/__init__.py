@@ -1,4 +1,4 @@
 from .sql_init import init_sql_database
-from .vector_init import init_vector_database
+from .vector_init import init_vector_database, acquire_client, release_client
 
-__all__ = ['init_sql_database', 'init_vector_database']
\ No newline at end of file
+__all__ = ['init_sql_database', 'init_vector_database', 'acquire_client', 'release_client']
\ No newline at end of file
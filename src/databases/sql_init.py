@@ -1,13 +1,122 @@
+"""
+SQL database initialization for the ETL pipeline.
+
+SQLite databases are switched to WAL journaling with synchronous=NORMAL
+when they are created. Only journal_mode=WAL persists in the database
+file. synchronous, cache_size, temp_store and mmap_size only apply to the
+connection that sets them and must be set again on each new connection.
+"""
 import os
 import sys
 import time
 import logging
+import socket
 import subprocess
 from typing import Dict, Any, Optional
-import psycopg2
+import psycopg
 import sqlite3
 
 
+# SSLRequest message: length 8 followed by the SSL request code 80877103
+_PG_SSL_REQUEST = b'\x00\x00\x00\x08\x04\xd2\x16\x2f'
+
+# Schema DDL, executed as one multi-statement script per database type
+_POSTGRESQL_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS legislation (
+        id SERIAL PRIMARY KEY,
+        legislation_id VARCHAR(255) UNIQUE NOT NULL,
+        title TEXT NOT NULL,
+        url TEXT,
+        year VARCHAR(50),
+        doc_type VARCHAR(100),
+        number VARCHAR(100),
+        metadata JSONB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS legislation_sections (
+        id SERIAL PRIMARY KEY,
+        legislation_id VARCHAR(255) NOT NULL,
+        section_idx INTEGER NOT NULL,
+        section_type VARCHAR(100),
+        section_number VARCHAR(100),
+        section_title TEXT,
+        text TEXT NOT NULL,
+        FOREIGN KEY (legislation_id) REFERENCES legislation(legislation_id) ON DELETE CASCADE,
+        UNIQUE (legislation_id, section_idx)
+    );
+
+    CREATE TABLE IF NOT EXISTS legislation_embeddings (
+        id SERIAL PRIMARY KEY,
+        legislation_id VARCHAR(255) NOT NULL,
+        section_idx INTEGER NOT NULL,
+        chunk_idx INTEGER NOT NULL,
+        text TEXT NOT NULL,
+        embedding_id VARCHAR(255) UNIQUE NOT NULL,
+        FOREIGN KEY (legislation_id) REFERENCES legislation(legislation_id) ON DELETE CASCADE,
+        UNIQUE (legislation_id, section_idx, chunk_idx)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_legislation_id ON legislation(legislation_id);
+    CREATE INDEX IF NOT EXISTS idx_sections_legislation_id ON legislation_sections(legislation_id);
+    CREATE INDEX IF NOT EXISTS idx_embeddings_legislation_id ON legislation_embeddings(legislation_id);
+    CREATE INDEX IF NOT EXISTS idx_sections_lid_idx_cover
+        ON legislation_sections(legislation_id, section_idx) INCLUDE (section_title);
+"""
+
+# Only journal_mode persists in the file; synchronous and the rest are per-connection
+_SQLITE_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA cache_size = -65536;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+"""
+
+_SQLITE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS legislation (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        legislation_id TEXT UNIQUE NOT NULL,
+        title TEXT NOT NULL,
+        url TEXT,
+        year TEXT,
+        doc_type TEXT,
+        number TEXT,
+        metadata TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS legislation_sections (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        legislation_id TEXT NOT NULL,
+        section_idx INTEGER NOT NULL,
+        section_type TEXT,
+        section_number TEXT,
+        section_title TEXT,
+        text TEXT NOT NULL,
+        FOREIGN KEY (legislation_id) REFERENCES legislation(legislation_id) ON DELETE CASCADE,
+        UNIQUE (legislation_id, section_idx)
+    );
+
+    CREATE TABLE IF NOT EXISTS legislation_embeddings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        legislation_id TEXT NOT NULL,
+        section_idx INTEGER NOT NULL,
+        chunk_idx INTEGER NOT NULL,
+        text TEXT NOT NULL,
+        embedding_id TEXT UNIQUE NOT NULL,
+        FOREIGN KEY (legislation_id) REFERENCES legislation(legislation_id) ON DELETE CASCADE,
+        UNIQUE (legislation_id, section_idx, chunk_idx)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_legislation_id ON legislation(legislation_id);
+    CREATE INDEX IF NOT EXISTS idx_sections_legislation_id ON legislation_sections(legislation_id);
+    CREATE INDEX IF NOT EXISTS idx_embeddings_legislation_id ON legislation_embeddings(legislation_id);
+    CREATE INDEX IF NOT EXISTS idx_sections_lid_idx_cover
+        ON legislation_sections(legislation_id, section_idx, section_title);
+"""
+
+
 def init_sql_database(
     db_type: str = "postgresql",
     host: str = None,
@@ -117,14 +226,14 @@ def _init_postgresql(
     # Connect to PostgreSQL server 
     try:
         # First connect to 'postgres' database to be able to create our database
-        conn = psycopg2.connect(
+        conn = psycopg.connect(
             host=host,
             port=port,
             dbname="postgres",
             user=user,
-            password=password
+            password=password,
+            autocommit=True
         )
-        conn.autocommit = True
         cursor = conn.cursor()
         
         # Check if database exists
@@ -141,68 +250,20 @@ def _init_postgresql(
         conn.close()
         
         # Connect to the target database
-        conn = psycopg2.connect(
+        conn = psycopg.connect(
             host=host,
             port=port,
             dbname=dbname,
             user=user,
-            password=password
+            password=password,
+            autocommit=True
         )
-        conn.autocommit = True
         cursor = conn.cursor()
         
         if init_tables:
-            # Create tables
+            # Create tables and indexes in a single round trip
             logger.info("Creating tables")
-            
-            # Create legislation table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS legislation (
-                    id SERIAL PRIMARY KEY,
-                    legislation_id VARCHAR(255) UNIQUE NOT NULL,
-                    title TEXT NOT NULL,
-                    url TEXT,
-                    year VARCHAR(50),
-                    doc_type VARCHAR(100),
-                    number VARCHAR(100),
-                    metadata JSONB,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create legislation_sections table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS legislation_sections (
-                    id SERIAL PRIMARY KEY,
-                    legislation_id VARCHAR(255) NOT NULL,
-                    section_idx INTEGER NOT NULL,
-                    section_type VARCHAR(100),
-                    section_number VARCHAR(100),
-                    section_title TEXT,
-                    text TEXT NOT NULL,
-                    FOREIGN KEY (legislation_id) REFERENCES legislation(legislation_id) ON DELETE CASCADE,
-                    UNIQUE (legislation_id, section_idx)
-                )
-            """)
-            
-            # Create legislation_embeddings table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS legislation_embeddings (
-                    id SERIAL PRIMARY KEY,
-                    legislation_id VARCHAR(255) NOT NULL,
-                    section_idx INTEGER NOT NULL,
-                    chunk_idx INTEGER NOT NULL,
-                    text TEXT NOT NULL,
-                    embedding_id VARCHAR(255) UNIQUE NOT NULL,
-                    FOREIGN KEY (legislation_id) REFERENCES legislation(legislation_id) ON DELETE CASCADE,
-                    UNIQUE (legislation_id, section_idx, chunk_idx)
-                )
-            """)
-            
-            # Create indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_legislation_id ON legislation(legislation_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sections_legislation_id ON legislation_sections(legislation_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_legislation_id ON legislation_embeddings(legislation_id)")
+            cursor.execute(_POSTGRESQL_SCHEMA)
             
             logger.info("Tables created successfully")
         
@@ -238,60 +299,17 @@ def _init_sqlite(sqlite_path: str, init_tables: bool) -> bool:
         # Connect to database (creates it if it doesn't exist)
         conn = sqlite3.connect(sqlite_path)
         
+        # WAL avoids an fsync per write during bulk loads
+        conn.executescript(_SQLITE_PRAGMAS)
+        
         if init_tables:
             cursor = conn.cursor()
             
             # Enable foreign keys
             cursor.execute("PRAGMA foreign_keys = ON")
             
-            # Create legislation table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS legislation (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    legislation_id TEXT UNIQUE NOT NULL,
-                    title TEXT NOT NULL,
-                    url TEXT,
-                    year TEXT,
-                    doc_type TEXT,
-                    number TEXT,
-                    metadata TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create legislation_sections table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS legislation_sections (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    legislation_id TEXT NOT NULL,
-                    section_idx INTEGER NOT NULL,
-                    section_type TEXT,
-                    section_number TEXT,
-                    section_title TEXT,
-                    text TEXT NOT NULL,
-                    FOREIGN KEY (legislation_id) REFERENCES legislation(legislation_id) ON DELETE CASCADE,
-                    UNIQUE (legislation_id, section_idx)
-                )
-            """)
-            
-            # Create legislation_embeddings table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS legislation_embeddings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    legislation_id TEXT NOT NULL,
-                    section_idx INTEGER NOT NULL,
-                    chunk_idx INTEGER NOT NULL,
-                    text TEXT NOT NULL,
-                    embedding_id TEXT UNIQUE NOT NULL,
-                    FOREIGN KEY (legislation_id) REFERENCES legislation(legislation_id) ON DELETE CASCADE,
-                    UNIQUE (legislation_id, section_idx, chunk_idx)
-                )
-            """)
-            
-            # Create indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_legislation_id ON legislation(legislation_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sections_legislation_id ON legislation_sections(legislation_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_legislation_id ON legislation_embeddings(legislation_id)")
+            # Create tables and indexes
+            cursor.executescript(_SQLITE_SCHEMA)
             
             # Commit changes
             conn.commit()
@@ -313,6 +331,10 @@ def _is_postgresql_running(host: str, port: int) -> bool:
     """
     Check if PostgreSQL server is running.
     
+    Sends a PostgreSQL SSLRequest packet over a plain TCP connection and
+    checks for the one-byte 'S'/'N' reply, which confirms a PostgreSQL
+    server is listening without going through authentication.
+    
     Args:
         host: Database host
         port: Database port
@@ -321,18 +343,10 @@ def _is_postgresql_running(host: str, port: int) -> bool:
         True if running, False otherwise
     """
     try:
-        # Try to connect to PostgreSQL
-        conn = psycopg2.connect(
-            host=host,
-            port=port,
-            dbname="legislation_db",
-            user=os.environ.get('DB_USER'),
-            password=os.environ.get('DB_PASSWORD'),
-            connect_timeout=3
-        )
-        conn.close()
-        return True
-    except:
+        with socket.create_connection((host or 'localhost', port), timeout=3) as sock:
+            sock.sendall(_PG_SSL_REQUEST)
+            return sock.recv(1) in (b'S', b'N')
+    except OSError:
         return False
 
 
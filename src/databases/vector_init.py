@@ -4,6 +4,8 @@ import time
 import logging
 import subprocess
 import socket
+import threading
+import concurrent.futures
 from typing import Dict, Any, Optional
 
 # Import qdrant_client for vector database operations
@@ -15,6 +17,165 @@ try:
 except ImportError:
     QDRANT_AVAILABLE = False
 
+# Sync clients shared across the process, keyed by connection settings and
+# reference-counted so a client is only closed when its last user releases it
+_CLIENT_POOL: Dict[tuple, "qdrant_client.QdrantClient"] = {}
+_CLIENT_REFS: Dict[tuple, int] = {}
+_POOL_LOCK = threading.Lock()
+
+# Keep idle gRPC channels alive between documents and allow large upsert batches
+GRPC_OPTIONS = {
+    "grpc.keepalive_time_ms": 10000,
+    "grpc.keepalive_timeout_ms": 5000,
+    "grpc.keepalive_permit_without_calls": 1,
+    "grpc.max_send_message_length": 32 * 1024 * 1024,
+    "grpc.max_receive_message_length": 32 * 1024 * 1024,
+}
+
+
+def acquire_client(
+    host: str = None,
+    port: int = None,
+    grpc_port: int = None,
+    prefer_grpc: bool = True
+) -> "qdrant_client.QdrantClient":
+    """
+    Get a shared Qdrant client, creating it on first use.
+    
+    Callers with the same connection settings share one client (and its HTTP
+    session and gRPC channel). Every call must be paired with release_client().
+    
+    Args:
+        host: Qdrant host
+        port: Qdrant HTTP port
+        grpc_port: Qdrant gRPC port
+        prefer_grpc: Whether to talk to Qdrant over gRPC instead of REST
+        
+    Returns:
+        Qdrant client for the given connection settings
+    """
+    host = host or os.environ.get('VECTOR_DB_HOST', 'localhost')
+    port = port or int(os.environ.get('VECTOR_DB_PORT', 6333))
+    grpc_port = grpc_port or int(os.environ.get('VECTOR_DB_GRPC_PORT', 6334))
+    key = (host, port, grpc_port, prefer_grpc)
+    
+    with _POOL_LOCK:
+        client = _CLIENT_POOL.get(key)
+        if client is None:
+            client = _create_client(host, port, grpc_port, prefer_grpc)
+            _CLIENT_POOL[key] = client
+        _CLIENT_REFS[key] = _CLIENT_REFS.get(key, 0) + 1
+    
+    return client
+
+
+def release_client(client: "qdrant_client.QdrantClient") -> None:
+    """
+    Release a client obtained from acquire_client(), closing it after its last user.
+    
+    Args:
+        client: Client returned by acquire_client()
+    """
+    with _POOL_LOCK:
+        for key, pooled in _CLIENT_POOL.items():
+            if pooled is client:
+                break
+        else:
+            return
+        
+        _CLIENT_REFS[key] -= 1
+        if _CLIENT_REFS[key] == 0:
+            del _CLIENT_REFS[key]
+            del _CLIENT_POOL[key]
+            client.close()
+
+
+def _create_client(host: str, port: int, grpc_port: int, prefer_grpc: bool) -> "qdrant_client.QdrantClient":
+    """Connect to Qdrant, retrying with exponential backoff"""
+    logger = logging.getLogger(__name__)
+    max_retries = 5
+    retry_delay = 2
+    
+    for attempt in range(max_retries):
+        try:
+            logger.info(f"Connecting to Qdrant at {host}:{port}")
+            client = qdrant_client.QdrantClient(
+                host=host,
+                port=port,
+                grpc_port=grpc_port,
+                prefer_grpc=prefer_grpc,
+                grpc_options=GRPC_OPTIONS,
+                pool_size=int(os.environ.get('VECTOR_DB_POOL_SIZE', 16)),
+                timeout=60
+            )
+            client.info()  # Test connection without listing collections
+            logger.info("Qdrant connection established successfully")
+            return client
+        except Exception as e:
+            logger.warning(f"Attempt {attempt + 1}/{max_retries} failed: {str(e)}")
+            if attempt < max_retries - 1:
+                logger.info(f"Retrying in {retry_delay} seconds...")
+                time.sleep(retry_delay)
+                retry_delay *= 2
+            else:
+                logger.error("Failed to connect to Qdrant after retries")
+                raise
+
+
+def create_collection(
+    client: "qdrant_client.QdrantClient",
+    collection_name: str,
+    vector_size: int,
+    quantization: bool = True
+) -> None:
+    """
+    Create the embeddings collection with its quantization and payload indexes.
+    
+    Shared by init_vector_database and VectorLoader so a collection has the same
+    layout whichever of them creates it.
+    
+    Args:
+        client: Qdrant client
+        collection_name: Name of the collection
+        vector_size: Size of embedding vectors
+        quantization: Whether to keep int8 scalar-quantized copies of the vectors
+    """
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=models.VectorParams(
+            size=vector_size,
+            distance=models.Distance.COSINE
+        ),
+        # int8 copies of the vectors kept in RAM for HNSW traversal;
+        # the float32 originals are used to rescore the candidates
+        quantization_config=models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+            )
+        ) if quantization else None
+    )
+    
+    # Index only the fields that are filtered or ordered on: legislation_id
+    # and section_type in filters, section_idx for ordered scrolls. The
+    # indexes are independent, so build them concurrently
+    payload_indexes = {
+        "legislation_id": models.PayloadSchemaType.KEYWORD,
+        "section_type": models.PayloadSchemaType.KEYWORD,
+        "section_idx": models.PayloadSchemaType.INTEGER,
+    }
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(payload_indexes)) as executor:
+        futures = [
+            executor.submit(
+                client.create_payload_index,
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
+            for field_name, field_schema in payload_indexes.items()
+        ]
+        for future in futures:
+            future.result()
+
 
 def init_vector_database(
     host: str = None,
@@ -22,7 +183,9 @@ def init_vector_database(
     grpc_port: int = None,
     vector_size: int = 384,  # Default for all-MiniLM-L6-v2 model
     collection_name: str = "legislation_embeddings",
-    recreate_collection: bool = False
+    recreate_collection: bool = False,
+    prefer_grpc: bool = True,
+    quantization: bool = True
 ) -> bool:
     """
     Initialize vector database for the ETL pipeline.
@@ -38,6 +201,8 @@ def init_vector_database(
         vector_size: Size of embedding vectors
         collection_name: Name of the collection
         recreate_collection: Whether to recreate the collection if it exists
+        prefer_grpc: Whether to talk to Qdrant over gRPC instead of REST
+        quantization: Whether to keep int8 scalar-quantized copies of the vectors
         
     Returns:
         True if successful, False otherwise
@@ -80,19 +245,12 @@ def init_vector_database(
             return False
     
     # Initialize client
+    client = None
     try:
-        client = qdrant_client.QdrantClient(
-            host=host,
-            port=port,
-            grpc_port=grpc_port,
-            timeout=60
-        )
-        
-        # Check if collection exists
-        collections = client.get_collections().collections
-        collection_names = [c.name for c in collections]
+        client = acquire_client(host, port, grpc_port, prefer_grpc)
         
-        if collection_name in collection_names:
+        # Check if collection exists; this is also the first API-level liveness check
+        if client.collection_exists(collection_name):
             if recreate_collection:
                 logger.info(f"Recreating collection: {collection_name}")
                 client.delete_collection(collection_name)
@@ -102,26 +260,7 @@ def init_vector_database(
         
         # Create collection
         logger.info(f"Creating collection: {collection_name}")
-        client.create_collection(
-            collection_name=collection_name,
-            vectors_config=models.VectorParams(
-                size=vector_size,
-                distance=models.Distance.COSINE
-            )
-        )
-        
-        # Create payload indexes for efficient filtering
-        client.create_payload_index(
-            collection_name=collection_name,
-            field_name="legislation_id",
-            field_schema=models.PayloadSchemaType.KEYWORD
-        )
-        
-        client.create_payload_index(
-            collection_name=collection_name,
-            field_name="section_idx",
-            field_schema=models.PayloadSchemaType.INTEGER
-        )
+        create_collection(client, collection_name, vector_size, quantization)
         
         logger.info(f"Vector database collection initialized: {collection_name}")
         return True
@@ -129,12 +268,18 @@ def init_vector_database(
     except Exception as e:
         logger.error(f"Error initializing vector database: {str(e)}")
         return False
+    finally:
+        if client is not None:
+            release_client(client)
 
 
 def _is_qdrant_running(host: str, port: int) -> bool:
     """
     Check if Qdrant server is running.
     
+    Only checks that the HTTP port accepts TCP connections; the first
+    get_collections() call on the real client confirms the API is ready.
+    
     Args:
         host: Qdrant host
         port: Qdrant HTTP port
@@ -143,17 +288,9 @@ def _is_qdrant_running(host: str, port: int) -> bool:
         True if running, False otherwise
     """
     try:
-        # Try to connect to Qdrant
-        client = qdrant_client.QdrantClient(
-            host=host,
-            port=port,
-            timeout=5
-        )
-        
-        # Test connection with a simple request
-        client.get_collections()
-        return True
-    except Exception:
+        with socket.create_connection((host, port), timeout=1):
+            return True
+    except OSError:
         return False
 
 
@@ -1,16 +1,44 @@
 import os
 import re
 import time
+import asyncio
+import contextlib
+import functools
 import logging
-import requests
+import zlib
+import sqlite3
+import threading
+import weakref
+import email.utils
+import httpx
 from typing import List, Dict, Optional, Generator, Any
-from datetime import datetime
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, quote
+from datetime import datetime, timezone
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urljoin, quote, urlsplit, urlunsplit
 import concurrent.futures
 import json
 import  hashlib
 
+# httpx only decodes brotli when the brotli package is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Selectors and patterns used on every page
+_RESULT_ROWS = 'tbody tr'
+_CONTENT_CONTAINER = '#content, .LegContent, .legislation-body'
+_TOC_LINKS = '.LegContents li a, #legContents li a'
+_SKIP_CLASSES = frozenset(('LegLabel', 'LegNav', 'watermark'))
+_MULTI_NL = re.compile(r'\n{3,}')
+
+
+@functools.lru_cache(maxsize=4096)
+def _hash_id(base_string: str) -> str:
+    # ASCII bytes equal the UTF-8 encoding, so IDs are unchanged
+    data = base_string.encode('ascii') if base_string.isascii() else base_string.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
 
 
 class LegislationScraper:
@@ -22,40 +50,200 @@ class LegislationScraper:
     BASE_URL = "https://www.legislation.gov.uk"
     SEARCH_URL = f"{BASE_URL}/all"
     
+    # Upper bound on requests to the site in flight at once, across every
+    # legislation and section being fetched
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    # Upper bound on section fetches (cache lookups included) in progress for
+    # one legislation; only MAX_CONCURRENT_REQUESTS of them reach the network
+    MAX_CONCURRENT_SECTIONS = 20
+    
+    # Upper bound on legislation items fetched at once in a batch
+    MAX_CONCURRENT_LEGISLATION = 10
+    
+    # Throttling responses that are retried, and the longest Retry-After honoured
+    RETRY_STATUSES = frozenset((429, 503))
+    MAX_RETRY_AFTER = 120.0
+    
     def __init__(self, cache_dir: str = "/data/cache"):
         self.logger = logging.getLogger(__name__)
         self.cache_dir = cache_dir
-        self.session = requests.Session()
+        # HTTP/2 multiplexes the concurrent section fetches over one connection;
+        # the async path builds its own client from the same options. The limits
+        # do not bound streams on an HTTP/2 connection, so async requests also
+        # take a slot from _request_slot()
+        self._client_options = {
+            'http2': True,
+            'limits': httpx.Limits(
+                max_connections=self.MAX_CONCURRENT_REQUESTS,
+                max_keepalive_connections=self.MAX_CONCURRENT_REQUESTS,
+            ),
+            'timeout': 30.0,
+            'follow_redirects': True,
+            'headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept-Encoding': ACCEPT_ENCODING,
+            },
+        }
+        self.session = httpx.Client(**self._client_options)
         os.makedirs(self.cache_dir, exist_ok=True)
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        })
+        
+        # Fetched pages live zlib-compressed in one SQLite file keyed by URL
+        # rather than one file per page; the lock serializes worker threads
+        self._cache_db = sqlite3.connect(os.path.join(self.cache_dir, 'pages.db'), check_same_thread=False)
+        self._cache_db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tocs (
+                url TEXT PRIMARY KEY,
+                entries TEXT NOT NULL
+            );
+        """)
+        self._cache_lock = threading.Lock()
+        
+        # Long-lived workers for blocking cache I/O, shared by every fetch
+        # instead of a fresh default executor per asyncio.run()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.MAX_CONCURRENT_SECTIONS, thread_name_prefix='scraper'
+        )
+        
+        # asyncio semaphores belong to one event loop, and the sync wrappers run
+        # a loop per call, so the request cap is kept per loop
+        self._request_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+    def _read_cache(self, url: str) -> Optional[str]:
+        with self._cache_lock:
+            row = self._cache_db.execute("SELECT content FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        self.logger.debug(f"Loading from cache: {url}")
+        content = row[0]
+        # Rows written before compression was added are plain text
+        return content if isinstance(content, str) else zlib.decompress(content).decode('utf-8')
 
-    def _get_cache_path(self, url: str) -> str:
-        filename = re.sub(r'[^a-zA-Z0-9]', '_', url) + '.html'
-        return os.path.join(self.cache_dir, filename)
+    def _write_cache(self, url: str, text: str) -> None:
+        with self._cache_lock:
+            self._cache_db.execute("INSERT OR REPLACE INTO pages (url, content) VALUES (?, ?)", (url, zlib.compress(text.encode('utf-8'))))
+            self._cache_db.commit()
+
+    def _read_toc(self, url: str) -> Optional[List[List[str]]]:
+        with self._cache_lock:
+            row = self._cache_db.execute("SELECT entries FROM tocs WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_toc(self, url: str, entries: List[List[str]]) -> None:
+        with self._cache_lock:
+            self._cache_db.execute("INSERT OR REPLACE INTO tocs (url, entries) VALUES (?, ?)", (url, json.dumps(entries)))
+            self._cache_db.commit()
+
+    async def _get_toc_async(self, client: httpx.AsyncClient, url: str, html_content: Optional[str] = None) -> List[List[str]]:
+        """
+        Get the (href, title) TOC entries of a legislation page, parsing the
+        page only the first time it is seen.
+        """
+        entries = await self._run_blocking(self._read_toc, url)
+        if entries is not None:
+            return entries
+        if html_content is None:
+            html_content = await self._fetch_with_cache_async(client, url)
+        entries = [
+            [item.attributes.get('href') or '', item.text().strip()]
+            for item in LexborHTMLParser(html_content).css(_TOC_LINKS)
+        ]
+        await self._run_blocking(self._write_toc, url, entries)
+        return entries
+
+    def _request_slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slot = self._request_slots.get(loop)
+        if slot is None:
+            slot = self._request_slots[loop] = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        return slot
+
+    def _retry_delay(self, error: httpx.HTTPError, backoff: float) -> float:
+        """
+        Seconds to wait before retrying a failed request.
+        
+        A throttled (429/503) response's Retry-After, given in seconds or as an
+        HTTP date, takes precedence over the exponential backoff.
+        """
+        if not isinstance(error, httpx.HTTPStatusError) or error.response.status_code not in self.RETRY_STATUSES:
+            return backoff
+        retry_after = error.response.headers.get('Retry-After')
+        if not retry_after:
+            return backoff
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (email.utils.parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return backoff
+        return min(max(delay, 0.0), self.MAX_RETRY_AFTER)
+
+    async def _run_blocking(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        self.session.close()
+        self._cache_db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _fetch_with_cache(self, url: str, force_refresh: bool = False) -> str:
-        cache_path = self._get_cache_path(url)
-        if os.path.exists(cache_path) and not force_refresh:
-            self.logger.debug(f"Loading from cache: {url}")
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                return f.read()
+        if not force_refresh:
+            cached = self._read_cache(url)
+            if cached is not None:
+                return cached
+        
+        max_retries = 3
+        retry_delay = 2
+        for attempt in range(max_retries):
+            try:
+                self.logger.debug(f"Fetching from web: {url}")
+                response = self.session.get(url)
+                response.raise_for_status()
+                self._write_cache(url, response.text)
+                return response.text
+            except httpx.HTTPError as e:
+                self.logger.warning(f"Attempt {attempt+1}/{max_retries} failed: {str(e)}")
+                if attempt < max_retries - 1:
+                    time.sleep(self._retry_delay(e, retry_delay))
+                    retry_delay *= 2
+                else:
+                    self.logger.error(f"Failed to fetch {url} after {max_retries} attempts")
+                    raise
+
+    async def _fetch_with_cache_async(self, client: httpx.AsyncClient, url: str, force_refresh: bool = False) -> str:
+        if not force_refresh:
+            cached = await self._run_blocking(self._read_cache, url)
+            if cached is not None:
+                return cached
         
         max_retries = 3
         retry_delay = 2
         for attempt in range(max_retries):
             try:
                 self.logger.debug(f"Fetching from web: {url}")
-                response = self.session.get(url, timeout=30)
+                # The slot is held for the request only, not the backoff
+                async with self._request_slot():
+                    response = await client.get(url)
                 response.raise_for_status()
-                with open(cache_path, 'w', encoding='utf-8') as f:
-                    f.write(response.text)
+                await self._run_blocking(self._write_cache, url, response.text)
                 return response.text
-            except requests.RequestException as e:
+            except httpx.HTTPError as e:
                 self.logger.warning(f"Attempt {attempt+1}/{max_retries} failed: {str(e)}")
                 if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
+                    await asyncio.sleep(self._retry_delay(e, retry_delay))
                     retry_delay *= 2
                 else:
                     self.logger.error(f"Failed to fetch {url} after {max_retries} attempts")
@@ -81,25 +269,25 @@ class LegislationScraper:
         
         html_content = self._fetch_with_cache(search_url)
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        tree = LexborHTMLParser(html_content)
         results = []
-        result_rows = soup.select('tbody tr')
+        result_rows = tree.css(_RESULT_ROWS)
         self.logger.info(f"Found {len(result_rows)} result rows in search page")
         
+        base_prefix = self.BASE_URL + '/'
         for row in result_rows[:max_results]:
             try:
-                title_cell = row.select_one('td:nth-child(1)')
-                if not title_cell or not title_cell.a:
+                # One flat walk over the row's cells instead of a selector per column
+                cells = [cell for cell in row.iter() if cell.tag == 'td']
+                link = cells[0].css_first('a') if cells else None
+                if link is None:
                     continue
-                title = title_cell.a.text.strip()
-                url = urljoin(self.BASE_URL, title_cell.a['href'])
-                year_cell = row.select_one('td:nth-child(2)')
-                year = year_cell.text.strip() if year_cell else ''
-                number_cell = row.select_one('td:nth-child(3)')
-                number = number_cell.text.strip() if number_cell else ''
-                type_cell = row.select_one('td:nth-child(4)')
-                leg_type = type_cell.text.strip() if type_cell else ''
-                doc_id = url.split(self.BASE_URL + '/')[1] if self.BASE_URL in url else ''
+                title = link.text().strip()
+                url = urljoin(self.BASE_URL, link.attributes['href'])
+                year = cells[1].text().strip() if len(cells) > 1 else ''
+                number = cells[2].text().strip() if len(cells) > 2 else ''
+                leg_type = cells[3].text().strip() if len(cells) > 3 else ''
+                doc_id = url.removeprefix(base_prefix) if url.startswith(base_prefix) else ''
                 legislation_meta = {
                     'title': title,
                     'url': url,
@@ -116,36 +304,65 @@ class LegislationScraper:
         self.logger.info(f"Total legislation items found: {len(results)}")
         return results
 
+    def _extract_section_text(self, html: str) -> str:
+        # Lexbor parses and matches selectors in C, creating Python objects
+        # only for the nodes that are actually visited
+        tree = LexborHTMLParser(html)
+        # BeautifulSoup (>=4.11) leaves script and style strings out of get_text(),
+        # whereas Lexbor's text() includes them; strip them to produce the same text
+        tree.strip_tags(['script', 'style'])
+        content_div = tree.css_first(_CONTENT_CONTAINER)
+        if content_div is None:
+            self.logger.warning("Content container not found")
+            return ""
+        paragraphs = []
+        for elem in content_div.css('p, div, span'):
+            # css() includes the container itself when it matches
+            if elem.mem_id == content_div.mem_id:
+                continue
+            if not _SKIP_CLASSES.isdisjoint((elem.attributes.get('class') or '').split()):
+                continue
+            text = elem.text(strip=True)
+            if text:
+                paragraphs.append(text)
+        full_text = '\n\n'.join(paragraphs)
+        full_text = _MULTI_NL.sub('\n\n', full_text).strip()
+        return full_text
+
     def fetch_single_section_content(self, url: str) -> str:
         self.logger.info(f"Fetching single section content: {url}")
         try:
-            html = self._fetch_with_cache(url)
-            soup = BeautifulSoup(html, 'html.parser')
-            content_div = soup.select_one('#content, .LegContent, .legislation-body')
-            if not content_div:
-                self.logger.warning("Content container not found")
-                return ""
-            paragraphs = []
-            for elem in content_div.find_all(['p', 'div', 'span'], recursive=True):
-                classes = elem.get('class', [])
-                if any(cls in ['LegLabel', 'LegNav', 'watermark'] for cls in classes):
-                    continue
-                text = elem.get_text(strip=True)
-                if text:
-                    paragraphs.append(text)
-            full_text = '\n\n'.join(paragraphs)
-            full_text = re.sub(r'\n{3,}', '\n\n', full_text).strip()
-            return full_text
+            return self._extract_section_text(self._fetch_with_cache(url))
+        except Exception as e:
+            self.logger.error(f"Error fetching section content: {e}")
+            return ""
+
+    async def fetch_single_section_content_async(self, client: httpx.AsyncClient, url: str) -> str:
+        self.logger.info(f"Fetching single section content: {url}")
+        try:
+            return self._extract_section_text(await self._fetch_with_cache_async(client, url))
         except Exception as e:
             self.logger.error(f"Error fetching section content: {e}")
             return ""
+
     def _generate_legislation_id(self, legislation_meta: Dict[str, Any]) -> str:
         """
         Generate a unique ID for legislation, based on URL or doc_id.
+        
+        The ID keys checkpoints, SQL rows and vector payloads from earlier
+        runs, so the hash must not change; SHA-256 is OpenSSL-backed and
+        runs once per legislation, which is negligible next to the fetch.
         """
         base_string = legislation_meta.get('url') or legislation_meta.get('doc_id') or str(time.time())
-        return hashlib.sha256(base_string.encode('utf-8')).hexdigest()
+        return _hash_id(base_string)
     def fetch_legislation_content(self, legislation_meta: Dict[str, str]) -> Dict[str, Any]:
+        return asyncio.run(self.fetch_legislation_content_async(legislation_meta))
+
+    async def fetch_legislation_content_async(
+        self,
+        legislation_meta: Dict[str, str],
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Dict[str, Any]:
         url = legislation_meta.get('url')
         doc_id = legislation_meta.get('doc_id')
         if not url or not doc_id:
@@ -153,54 +370,30 @@ class LegislationScraper:
             return None
         self.logger.info(f"Fetching legislation content: {legislation_meta.get('title')}")
         try:
-            html_content = self._fetch_with_cache(url)
-            result = {
-                **legislation_meta,
-                'html_content': html_content,
-                'sections': [],
-                'fetch_timestamp': datetime.now().isoformat()
-            }
-            # Generate and add stable unique ID
-            result['id'] = self._generate_legislation_id(result)
-            soup = BeautifulSoup(html_content, 'html.parser')
-            toc_items = soup.select('.LegContents li a, #legContents li a')
-            if not toc_items:
-                self.logger.info("No table of contents found, extracting main content")
-                main_text = self.fetch_single_section_content(url)
-                if main_text:
-                    result['sections'].append({
-                        'title': 'Main Content',
-                        'url': url,
-                        'content': main_text,
-                        'html': ''
-                    })
-                return result
-
-            self.logger.info(f"Found {len(toc_items)} table of contents items")
-
-            # Use ThreadPoolExecutor for concurrent fetching of sections
-            def fetch_section(item):
-                section_url = urljoin(self.BASE_URL, item.get('href', ''))
-                section_title = item.text.strip()
-                if '#' in section_url and section_url.split('#')[0] == url:
-                    return None
-                content = self.fetch_single_section_content(section_url)
-                if content:
-                    return {
-                        'title': section_title,
-                        'url': section_url,
-                        'content': content,
-                        'html': ''
-                    }
-                return None
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                futures = [executor.submit(fetch_section, item) for item in toc_items]
-                for future in concurrent.futures.as_completed(futures):
-                    section = future.result()
-                    if section:
-                        result['sections'].append(section)
-                        self.logger.debug(f"Added section: {section['title']}")
+            async with contextlib.AsyncExitStack() as stack:
+                # An AsyncClient is bound to the event loop that uses it, so a
+                # call without one gets its own; all sections share its HTTP/2 connection
+                if client is None:
+                    client = await stack.enter_async_context(httpx.AsyncClient(**self._client_options))
+                html_content = await self._fetch_with_cache_async(client, url)
+                result = {
+                    **legislation_meta,
+                    'html_content': html_content,
+                    'sections': [],
+                    'fetch_timestamp': datetime.now().isoformat()
+                }
+                # Generate and add stable unique ID
+                result['id'] = self._generate_legislation_id(result)
+                # Slots are allocated in TOC order up front and filled as fetches
+                # complete, so the section order is the same on every run
+                tasks = await self._start_section_tasks(client, url, html_content)
+                sections = [None] * len(tasks)
+                try:
+                    for position, section in await asyncio.gather(*tasks):
+                        sections[position] = section
+                finally:
+                    await self._cancel_tasks(tasks)
+                result['sections'] = [section for section in sections if section is not None]
 
             total_chars = sum(len(s['content']) for s in result['sections'])
             self.logger.info(f"Total content extracted: {total_chars} characters in {len(result['sections'])} sections")
@@ -208,9 +401,151 @@ class LegislationScraper:
         except Exception as e:
             self.logger.error(f"Error fetching legislation content for {url}: {str(e)}")
             return None
+
+    async def fetch_legislation_batch_async(
+        self,
+        items: List[Dict[str, str]],
+        max_concurrent: int = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fetch several legislation items concurrently over one shared client.
         
-   
+        Args:
+            items: Legislation metadata from search_legislation
+            max_concurrent: Maximum number of legislation items in flight
+            
+        Returns:
+            Fetched legislation data in the order of items, None where a fetch failed
+        """
+        semaphore = asyncio.Semaphore(max_concurrent or self.MAX_CONCURRENT_LEGISLATION)
         
+        async with httpx.AsyncClient(**self._client_options) as client:
+            async def fetch(item):
+                async with semaphore:
+                    return await self.fetch_legislation_content_async(item, client)
+            
+            results = await asyncio.gather(*(fetch(item) for item in items), return_exceptions=True)
+        
+        for item, result in zip(items, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error fetching legislation {item.get('doc_id')}: {str(result)}")
+        return [None if isinstance(result, Exception) else result for result in results]
+
+    def fetch_legislation_sections(self, legislation_meta: Dict[str, str]) -> Generator[Dict[str, Any], None, None]:
+        """
+        Yield the sections of a legislation as they are fetched, so only one
+        section needs to be held by the caller at a time.
+        """
+        url = legislation_meta.get('url')
+        if not url:
+            self.logger.error("Missing URL in legislation metadata")
+            return
+        
+        # Drive the async generator one section at a time on a private loop
+        loop = asyncio.new_event_loop()
+        sections = self.fetch_legislation_sections_async(url)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(sections.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(sections.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    async def fetch_legislation_sections_async(self, url: str):
+        # With a cached TOC the legislation page itself is not needed
+        async with httpx.AsyncClient(**self._client_options) as client:
+            async with contextlib.aclosing(self._iter_sections_async(client, url)) as sections:
+                async for section in sections:
+                    yield section
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        parts = urlsplit(url)
+        return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, parts.query, ''))
+
+    async def _iter_sections_async(self, client: httpx.AsyncClient, url: str, html_content: Optional[str] = None):
+        tasks = await self._start_section_tasks(client, url, html_content)
+        try:
+            # Hand each section on as soon as it completes
+            for next_done in asyncio.as_completed(tasks):
+                _, section = await next_done
+                if section:
+                    yield section
+        finally:
+            # Stop outstanding fetches if the consumer stops early
+            await self._cancel_tasks(tasks)
+
+    @staticmethod
+    async def _cancel_tasks(tasks: List["asyncio.Task"]) -> None:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _start_section_tasks(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        html_content: Optional[str] = None
+    ) -> List["asyncio.Task"]:
+        """
+        Schedule a fetch for every unique section page of a legislation.
+        
+        Each task resolves to (position, section), where position is the
+        section's index in TOC order and section is None when the page is
+        empty or could not be fetched.
+        """
+        toc_items = await self._get_toc_async(client, url, html_content)
+        if toc_items:
+            self.logger.info(f"Found {len(toc_items)} table of contents items")
+        else:
+            self.logger.info("No table of contents found, extracting main content")
+
+        # Resolve and dedupe TOC links up front so only unique pages other
+        # than the legislation's own page are scheduled
+        page_url = url.split('#', 1)[0]
+        seen = set()
+        unique_items = []
+        for href, section_title in toc_items:
+            section_url = urljoin(self.BASE_URL, href)
+            page = section_url.split('#', 1)[0]
+            if '#' in section_url and page == page_url:
+                continue
+            key = self._normalize_url(section_url)
+            if key in seen:
+                continue
+            seen.add(key)
+            unique_items.append((section_url, section_title))
+        if not toc_items:
+            unique_items.append((url, 'Main Content'))
+
+        # Fetch all sections concurrently, bounded by MAX_CONCURRENT_SECTIONS
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SECTIONS)
+
+        async def fetch_section(position, section_url, section_title):
+            try:
+                async with semaphore:
+                    content = await self.fetch_single_section_content_async(client, section_url)
+            except Exception as e:
+                self.logger.warning(f"Error fetching section: {str(e)}")
+                return position, None
+            if content:
+                return position, {
+                    'title': section_title,
+                    'url': section_url,
+                    'content': content,
+                    'html': ''
+                }
+            return position, None
+
+        return [
+            asyncio.ensure_future(fetch_section(position, *entry))
+            for position, entry in enumerate(unique_items)
+        ]
+
     def fetch_all_legislation(
         self, 
         time_period: str,
@@ -224,14 +559,7 @@ class LegislationScraper:
         for i in range(0, len(items), batch_size):
             batch = items[i:i+batch_size]
             self.logger.info(f"Processing batch {i//batch_size + 1} ({len(batch)} items)")
-            results = []
-            for item in batch:
-                try:
-                    res = self.fetch_legislation_content(item)
-                    if res:
-                        results.append(res)
-                except Exception as e:
-                    self.logger.error(f"Error processing item {item.get('doc_id')}: {str(e)}")
-            yield results
+            results = asyncio.run(self.fetch_legislation_batch_async(batch))
+            yield [res for res in results if res]
 
 
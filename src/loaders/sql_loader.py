@@ -2,11 +2,223 @@ import os
 import json
 import logging
 import time
-from typing import Dict, Any, List, Optional
-import psycopg2
-from psycopg2.extras import Json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 import sqlite3
 
+# orjson serializes metadata in C when available
+try:
+    import orjson
+
+    def _dump_json(value: Any) -> str:
+        return orjson.dumps(value).decode()
+except ImportError:
+    def _dump_json(value: Any) -> str:
+        return json.dumps(value)
+
+
+# WAL lets readers run alongside the loader and avoids an fsync per commit
+_SQLITE_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -65536;
+    PRAGMA foreign_keys = ON;
+"""
+
+# Bulk-load-only mode: no journal and no fsync, a crash can corrupt the file
+_SQLITE_BULK_PRAGMAS = """
+    PRAGMA journal_mode = OFF;
+    PRAGMA synchronous = OFF;
+"""
+
+
+_SECTION_COLUMNS = "legislation_id, section_idx, section_type, section_number, section_title, text"
+_EMBEDDING_COLUMNS = "legislation_id, section_idx, chunk_idx, text, embedding_id"
+
+# Child rows are upserted on their unique keys and only stale rows are
+# deleted, so re-ingesting an unchanged document rewrites nothing
+_UPSERT_SECTION_CONFLICT = """
+    ON CONFLICT (legislation_id, section_idx) DO UPDATE SET
+        section_type = EXCLUDED.section_type,
+        section_number = EXCLUDED.section_number,
+        section_title = EXCLUDED.section_title,
+        text = EXCLUDED.text
+    WHERE (legislation_sections.section_type, legislation_sections.section_number,
+           legislation_sections.section_title, legislation_sections.text)
+        IS DISTINCT FROM
+          (EXCLUDED.section_type, EXCLUDED.section_number, EXCLUDED.section_title, EXCLUDED.text)
+"""
+_UPSERT_EMBEDDING_CONFLICT = """
+    ON CONFLICT (legislation_id, section_idx, chunk_idx) DO UPDATE SET
+        text = EXCLUDED.text,
+        embedding_id = EXCLUDED.embedding_id
+    WHERE (legislation_embeddings.text, legislation_embeddings.embedding_id)
+        IS DISTINCT FROM (EXCLUDED.text, EXCLUDED.embedding_id)
+"""
+
+# Temp staging tables for COPY, created once per PostgreSQL session. The
+# connections use prepare_threshold=0, so psycopg prepares every statement
+# below on first use and the server skips parsing and planning afterwards
+_PG_SESSION_SETUP = """
+    CREATE TEMP TABLE IF NOT EXISTS stage_sections (
+        legislation_id TEXT, section_idx INTEGER, section_type TEXT,
+        section_number TEXT, section_title TEXT, text TEXT
+    );
+    CREATE TEMP TABLE IF NOT EXISTS stage_embeddings (
+        legislation_id TEXT, section_idx INTEGER, chunk_idx INTEGER,
+        text TEXT, embedding_id TEXT
+    );
+"""
+_PG_UPSERT_LEGISLATION = """
+    INSERT INTO legislation
+    (legislation_id, title, url, year, doc_type, number, metadata)
+    VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb)
+    ON CONFLICT (legislation_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        url = EXCLUDED.url,
+        year = EXCLUDED.year,
+        doc_type = EXCLUDED.doc_type,
+        number = EXCLUDED.number,
+        metadata = EXCLUDED.metadata
+"""
+_PG_DELETE_STALE_SECTIONS = "DELETE FROM legislation_sections WHERE legislation_id = %s AND section_idx >= %s"
+_PG_DELETE_STALE_EMBEDDINGS = "DELETE FROM legislation_embeddings WHERE legislation_id = %s AND embedding_id <> ALL(%s)"
+# COPY cannot resolve conflicts, so rows go to a staging table and are merged
+_PG_COPY_SECTIONS = (
+    f"COPY stage_sections ({_SECTION_COLUMNS}) FROM STDIN",
+    f"""
+    WITH staged AS (DELETE FROM stage_sections RETURNING *)
+    INSERT INTO legislation_sections ({_SECTION_COLUMNS})
+    SELECT {_SECTION_COLUMNS} FROM staged
+    {_UPSERT_SECTION_CONFLICT}
+    """,
+)
+_PG_COPY_EMBEDDINGS = (
+    f"COPY stage_embeddings ({_EMBEDDING_COLUMNS}) FROM STDIN",
+    f"""
+    WITH staged AS (DELETE FROM stage_embeddings RETURNING *)
+    INSERT INTO legislation_embeddings ({_EMBEDDING_COLUMNS})
+    SELECT {_EMBEDDING_COLUMNS} FROM staged
+    {_UPSERT_EMBEDDING_CONFLICT}
+    """,
+)
+_PG_UPSERT_SECTION = (
+    f"INSERT INTO legislation_sections ({_SECTION_COLUMNS}) VALUES (%s, %s, %s, %s, %s, %s) {_UPSERT_SECTION_CONFLICT}"
+)
+_PG_UPSERT_EMBEDDING = (
+    f"INSERT INTO legislation_embeddings ({_EMBEDDING_COLUMNS}) VALUES (%s, %s, %s, %s, %s) {_UPSERT_EMBEDDING_CONFLICT}"
+)
+
+# Read paths list their columns so the large text columns are only fetched
+# (and detoasted) when asked for
+_SECTION_META_COLUMNS = "id, legislation_id, section_idx, section_type, section_number, section_title"
+_EMBEDDING_META_COLUMNS = "id, legislation_id, section_idx, chunk_idx, embedding_id"
+
+# The whole document (parent row plus its sections and embedding refs) is
+# assembled server-side into one JSONB value
+_PG_LEGISLATION_TEMPLATE = """
+    SELECT to_jsonb(l) || jsonb_build_object(
+        'content', COALESCE(
+            (SELECT jsonb_agg(to_jsonb(s) ORDER BY s.section_idx)
+             FROM (SELECT {section_columns} FROM legislation_sections
+                   WHERE legislation_id = l.legislation_id) s),
+            '[]'::jsonb
+        ),
+        'embedding_refs', COALESCE(
+            (SELECT jsonb_agg(to_jsonb(e) ORDER BY e.section_idx, e.chunk_idx)
+             FROM (SELECT {embedding_columns} FROM legislation_embeddings
+                   WHERE legislation_id = l.legislation_id) e),
+            '[]'::jsonb
+        )
+    )
+    FROM legislation l
+    WHERE l.legislation_id = %s
+"""
+_PG_LEGISLATION_META_BY_ID = _PG_LEGISLATION_TEMPLATE.format(
+    section_columns=_SECTION_META_COLUMNS, embedding_columns=_EMBEDDING_META_COLUMNS
+)
+_PG_LEGISLATION_BY_ID = _PG_LEGISLATION_TEMPLATE.format(
+    section_columns=f"{_SECTION_META_COLUMNS}, text", embedding_columns=f"{_EMBEDDING_META_COLUMNS}, text"
+)
+
+_EMBEDDING_INFO_TEMPLATE = """
+    SELECT e.id, e.legislation_id, e.section_idx, e.chunk_idx, e.embedding_id,{text} l.title, s.section_title
+    FROM legislation_embeddings e
+    JOIN legislation l ON e.legislation_id = l.legislation_id
+    JOIN legislation_sections s ON e.legislation_id = s.legislation_id AND e.section_idx = s.section_idx
+"""
+_EMBEDDING_INFO_META_SELECT = _EMBEDDING_INFO_TEMPLATE.format(text="")
+_EMBEDDING_INFO_SELECT = _EMBEDDING_INFO_TEMPLATE.format(text=" e.text,")
+_PG_EMBEDDING_INFO_META = _EMBEDDING_INFO_META_SELECT + "WHERE e.embedding_id = ANY(%s)"
+_PG_EMBEDDING_INFO = _EMBEDDING_INFO_SELECT + "WHERE e.embedding_id = ANY(%s)"
+# SQLite takes the ids as one JSON array parameter; a placeholder per id would
+# hit SQLITE_MAX_VARIABLE_NUMBER on long id lists
+_SQLITE_EMBEDDING_INFO_META = _EMBEDDING_INFO_META_SELECT + "WHERE e.embedding_id IN (SELECT value FROM json_each(?))"
+_SQLITE_EMBEDDING_INFO = _EMBEDDING_INFO_SELECT + "WHERE e.embedding_id IN (SELECT value FROM json_each(?))"
+
+_PG_SECTION_TEXT = "SELECT text FROM legislation_sections WHERE legislation_id = %s AND section_idx = %s"
+_SQLITE_SECTION_TEXT = "SELECT text FROM legislation_sections WHERE legislation_id = ? AND section_idx = ?"
+
+# SQLite caches compiled statements by SQL text, so these must stay constant
+_SQLITE_UPSERT_LEGISLATION = """
+    INSERT INTO legislation
+    (legislation_id, title, url, year, doc_type, number, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (legislation_id) DO UPDATE SET
+        title = excluded.title,
+        url = excluded.url,
+        year = excluded.year,
+        doc_type = excluded.doc_type,
+        number = excluded.number,
+        metadata = excluded.metadata
+"""
+_SQLITE_DELETE_STALE_SECTIONS = "DELETE FROM legislation_sections WHERE legislation_id = ? AND section_idx >= ?"
+_SQLITE_DELETE_STALE_EMBEDDINGS = """
+    DELETE FROM legislation_embeddings
+    WHERE legislation_id = ? AND embedding_id NOT IN (SELECT value FROM json_each(?))
+"""
+_SQLITE_UPSERT_SECTION = (
+    f"INSERT INTO legislation_sections ({_SECTION_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?) {_UPSERT_SECTION_CONFLICT}"
+)
+_SQLITE_UPSERT_EMBEDDING = (
+    f"INSERT INTO legislation_embeddings ({_EMBEDDING_COLUMNS}) VALUES (?, ?, ?, ?, ?) {_UPSERT_EMBEDDING_CONFLICT}"
+)
+
+
+def _section_rows(legislation_id: str, sections: List[Dict[str, Any]]) -> Iterator[tuple]:
+    """Yield legislation_sections rows in _SECTION_COLUMNS order"""
+    for idx, section in enumerate(sections):
+        get = section.get
+        yield (
+            legislation_id,
+            idx,
+            get("section_type", ""),
+            get("section_number", ""),
+            get("section_title", ""),
+            get("text", ""),
+        )
+
+
+def _embedding_rows(legislation_id: str, embeddings: List[Dict[str, Any]]) -> Tuple[List[tuple], List[str]]:
+    """Build legislation_embeddings rows in _EMBEDDING_COLUMNS order, plus their embedding ids"""
+    rows = []
+    embedding_ids = []
+    prefix = f"{legislation_id}_s"
+    for embedding_data in embeddings:
+        get = embedding_data.get
+        section_idx = get("section_idx", 0)
+        chunk_idx = get("chunk_idx", 0)
+        embedding_id = f"{prefix}{section_idx}_c{chunk_idx}"
+        rows.append((legislation_id, section_idx, chunk_idx, get("text", ""), embedding_id))
+        embedding_ids.append(embedding_id)
+    return rows, embedding_ids
+
 
 class SQLLoader:
     """
@@ -22,9 +234,21 @@ class SQLLoader:
         user: Optional[str] = None,
         password: Optional[str] = None,
         sqlite_path: Optional[str] = None,
+        use_copy: Optional[bool] = None,
+        bulk_load: Optional[bool] = None,
+        pool_size: Optional[int] = None,
     ):
         self.logger = logging.getLogger(__name__)
         self.db_type = db_type.lower()
+        # COPY bypasses rules on the target tables; set SQL_USE_COPY=false to
+        # fall back to pipelined INSERTs where those are required
+        if use_copy is None:
+            use_copy = os.environ.get("SQL_USE_COPY", "true").lower() != "false"
+        self.use_copy = use_copy
+        # Unsafe SQLite settings for throwaway bulk loads (SQLITE_BULK_LOAD=true)
+        if bulk_load is None:
+            bulk_load = os.environ.get("SQLITE_BULK_LOAD", "false").lower() == "true"
+        self.bulk_load = bulk_load
 
         if self.db_type == "postgresql":
             self.host = host or os.environ.get("DB_HOST", "localhost")
@@ -32,6 +256,9 @@ class SQLLoader:
             self.dbname = dbname or os.environ.get("DB_NAME", "legislation_db")
             self.user = user or os.environ.get("DB_USER", "etl_user")
             self.password = password or os.environ.get("DB_PASSWORD", "etl_password")
+            # Connections available to batch_store_legislation workers
+            self.pool_size = pool_size or int(os.environ.get("DB_POOL_SIZE", 4))
+            self.pool = None
             self.conn = None
         elif self.db_type == "sqlite":
             self.sqlite_path = sqlite_path or os.environ.get(
@@ -41,6 +268,31 @@ class SQLLoader:
         else:
             raise ValueError(f"Unsupported database type: {self.db_type}")
 
+        # Bind backend-specific SQL, id list encoding and bulk upsert strategy
+        # once so the store path never branches on db_type
+        if self.db_type == "postgresql":
+            self._sql = {
+                "upsert_legislation": _PG_UPSERT_LEGISLATION,
+                "delete_stale_sections": _PG_DELETE_STALE_SECTIONS,
+                "delete_stale_embeddings": _PG_DELETE_STALE_EMBEDDINGS,
+                "upsert_sections": _PG_COPY_SECTIONS if self.use_copy else _PG_UPSERT_SECTION,
+                "upsert_embeddings": _PG_COPY_EMBEDDINGS if self.use_copy else _PG_UPSERT_EMBEDDING,
+            }
+            self._id_list = list
+            self._insert_rows = self._copy_rows if self.use_copy else self._insert_many
+        else:
+            self._sql = {
+                "upsert_legislation": _SQLITE_UPSERT_LEGISLATION,
+                "delete_stale_sections": _SQLITE_DELETE_STALE_SECTIONS,
+                "delete_stale_embeddings": _SQLITE_DELETE_STALE_EMBEDDINGS,
+                "upsert_sections": _SQLITE_UPSERT_SECTION,
+                "upsert_embeddings": _SQLITE_UPSERT_EMBEDDING,
+            }
+            self._id_list = json.dumps
+            self._insert_rows = self._insert_many
+
+        # Connections whose session already has the staging tables
+        self._prepared = set()
         self._connect()
         self._init_tables()
 
@@ -54,19 +306,39 @@ class SQLLoader:
                     self.logger.info(
                         f"Connecting to PostgreSQL database {self.dbname} at {self.host}:{self.port}"
                     )
-                    self.conn = psycopg2.connect(
-                        host=self.host,
-                        port=self.port,
-                        dbname=self.dbname,
-                        user=self.user,
-                        password=self.password,
-                    )
+                    if self.pool is None:
+                        pool = ConnectionPool(
+                            min_size=1,
+                            # One extra for the connection held in self.conn
+                            max_size=self.pool_size + 1,
+                            kwargs={
+                                "host": self.host,
+                                "port": self.port,
+                                "dbname": self.dbname,
+                                "user": self.user,
+                                "password": self.password,
+                                "autocommit": True,
+                                "prepare_threshold": 0,
+                            },
+                            open=True,
+                        )
+                        try:
+                            pool.wait(timeout=10)
+                        except Exception:
+                            pool.close()
+                            raise
+                        self.pool = pool
+                    # The loader keeps one pooled connection for single-document work
+                    self.conn = self.pool.getconn()
                     self.conn.autocommit = True
                 else:
                     self.logger.info(f"Connecting to SQLite database at {self.sqlite_path}")
                     os.makedirs(os.path.dirname(self.sqlite_path), exist_ok=True)
-                    self.conn = sqlite3.connect(self.sqlite_path)
-                    self.conn.execute("PRAGMA foreign_keys = ON")
+                    self.conn = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+                    self.conn.row_factory = sqlite3.Row
+                    self.conn.executescript(_SQLITE_PRAGMAS)
+                    if self.bulk_load:
+                        self.conn.executescript(_SQLITE_BULK_PRAGMAS)
 
                 self.logger.info("Database connection established successfully")
                 break
@@ -138,6 +410,11 @@ class SQLLoader:
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_legislation_id ON legislation(legislation_id)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_sections_legislation_id ON legislation_sections(legislation_id)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_legislation_id ON legislation_embeddings(legislation_id)")
+                # Covers the section_title lookup in get_embedding_info without a heap fetch
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_sections_lid_idx_cover "
+                    "ON legislation_sections(legislation_id, section_idx) INCLUDE (section_title)"
+                )
             else:
                 # SQLite schema
                 cursor.execute(
@@ -187,6 +464,10 @@ class SQLLoader:
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_legislation_id ON legislation(legislation_id)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_sections_legislation_id ON legislation_sections(legislation_id)")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_legislation_id ON legislation_embeddings(legislation_id)")
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_sections_lid_idx_cover "
+                    "ON legislation_sections(legislation_id, section_idx, section_title)"
+                )
 
             self.conn.commit()
             self.logger.info("Database tables initialized successfully")
@@ -200,6 +481,93 @@ class SQLLoader:
             if cursor:
                 cursor.close()
 
+    @contextmanager
+    def _pooled_connection(self):
+        """Borrow an autocommit connection from the PostgreSQL pool"""
+        conn = self.pool.getconn()
+        conn.autocommit = True
+        try:
+            yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    def _prepare_session(self, conn) -> None:
+        """
+        Create the COPY staging tables on a PostgreSQL session. Runs in
+        autocommit mode so a later rollback cannot drop the temp tables.
+        """
+        if self.db_type == "postgresql" and conn not in self._prepared:
+            with conn.cursor() as cursor:
+                cursor.execute(_PG_SESSION_SETUP, prepare=False)
+            self._prepared.add(conn)
+
+    @staticmethod
+    def _copy_rows(cursor, sql: tuple, rows: Iterable[tuple]) -> None:
+        """Stream rows into a staging table with COPY, then merge them (sql is (copy, merge))"""
+        copy_sql, merge_sql = sql
+        with cursor.copy(copy_sql) as copy:
+            for row in rows:
+                copy.write_row(row)
+        cursor.execute(merge_sql)
+
+    @staticmethod
+    def _insert_many(cursor, sql: str, rows: Iterable[tuple]) -> None:
+        """Upsert rows with a single-row statement executed per row (pipelined on PostgreSQL)"""
+        cursor.executemany(sql, rows)
+
+    def _pipeline(self, conn):
+        """
+        Send a document's statements in one flight when they do not include
+        COPY, which pipeline mode does not support.
+        """
+        if self.db_type == "postgresql" and not self.use_copy:
+            return conn.pipeline()
+        return nullcontext()
+
+    def _store_legislation(self, cursor, legislation_data: Dict[str, Any]) -> None:
+        """
+        Write one legislation document without committing.
+
+        Args:
+            cursor: Cursor of the transaction the rows are written in
+            legislation_data: Processed legislation document
+
+        Raises:
+            Exception: Propagated from the database driver so the caller can roll back
+        """
+        legislation_id = legislation_data["id"]
+
+        # Insert or update legislation main record
+        cursor.execute(
+            self._sql["upsert_legislation"],
+            (
+                legislation_id,
+                legislation_data.get("title", ""),
+                legislation_data.get("url", ""),
+                legislation_data.get("year", ""),
+                legislation_data.get("type", ""),
+                legislation_data.get("number", ""),
+                _dump_json(legislation_data.get("metadata", {})),
+            ),
+        )
+
+        # Store sections
+        if "content" in legislation_data and legislation_data["content"]:
+            sections = legislation_data["content"]
+            # A generator lets executemany/COPY consume rows without building a list
+            section_rows = _section_rows(legislation_id, sections)
+            self._insert_rows(cursor, self._sql["upsert_sections"], section_rows)
+            cursor.execute(self._sql["delete_stale_sections"], (legislation_id, len(sections)))
+
+        # Store embedding references (not the vectors)
+        if "embeddings" in legislation_data and legislation_data["embeddings"]:
+            embedding_rows, embedding_ids = _embedding_rows(legislation_id, legislation_data["embeddings"])
+            self._insert_rows(cursor, self._sql["upsert_embeddings"], embedding_rows)
+            cursor.execute(
+                self._sql["delete_stale_embeddings"],
+                (legislation_id, self._id_list(embedding_ids)),
+            )
+
     def store_legislation(self, legislation_data: Dict[str, Any]) -> bool:
         if not self.conn:
             self._connect()
@@ -211,137 +579,15 @@ class SQLLoader:
         legislation_id = legislation_data["id"]
         cursor = None
 
+        # Store the parent row and its child rows in one transaction
+        self._prepare_session(self.conn)
+        if self.db_type == "postgresql":
+            self.conn.autocommit = False
+
         try:
             cursor = self.conn.cursor()
-
-            # Insert or update legislation main record
-            if self.db_type == "postgresql":
-                cursor.execute(
-                    """
-                    INSERT INTO legislation
-                    (legislation_id, title, url, year, doc_type, number, metadata)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (legislation_id) DO UPDATE SET
-                        title = EXCLUDED.title,
-                        url = EXCLUDED.url,
-                        year = EXCLUDED.year,
-                        doc_type = EXCLUDED.doc_type,
-                        number = EXCLUDED.number,
-                        metadata = EXCLUDED.metadata
-                    """,
-                    (
-                        legislation_id,
-                        legislation_data.get("title", ""),
-                        legislation_data.get("url", ""),
-                        legislation_data.get("year", ""),
-                        legislation_data.get("type", ""),
-                        legislation_data.get("number", ""),
-                        Json(legislation_data.get("metadata", {})),
-                    ),
-                )
-            else:
-                cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO legislation
-                    (legislation_id, title, url, year, doc_type, number, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        legislation_id,
-                        legislation_data.get("title", ""),
-                        legislation_data.get("url", ""),
-                        legislation_data.get("year", ""),
-                        legislation_data.get("type", ""),
-                        legislation_data.get("number", ""),
-                        json.dumps(legislation_data.get("metadata", {})),
-                    ),
-                )
-
-            # Store sections
-            if "content" in legislation_data and legislation_data["content"]:
-                cursor.execute(
-                    "DELETE FROM legislation_sections WHERE legislation_id = %s"
-                    if self.db_type == "postgresql"
-                    else "DELETE FROM legislation_sections WHERE legislation_id = ?",
-                    (legislation_id,),
-                )
-
-                for idx, section in enumerate(legislation_data["content"]):
-                    if self.db_type == "postgresql":
-                        cursor.execute(
-                            """
-                            INSERT INTO legislation_sections
-                            (legislation_id, section_idx, section_type, section_number, section_title, text)
-                            VALUES (%s, %s, %s, %s, %s, %s)
-                            """,
-                            (
-                                legislation_id,
-                                idx,
-                                section.get("section_type", ""),
-                                section.get("section_number", ""),
-                                section.get("section_title", ""),
-                                section.get("text", ""),
-                            ),
-                        )
-                    else:
-                        cursor.execute(
-                            """
-                            INSERT INTO legislation_sections
-                            (legislation_id, section_idx, section_type, section_number, section_title, text)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                            """,
-                            (
-                                legislation_id,
-                                idx,
-                                section.get("section_type", ""),
-                                section.get("section_number", ""),
-                                section.get("section_title", ""),
-                                section.get("text", ""),
-                            ),
-                        )
-
-            # Store embedding references (not the vectors)
-            if "embeddings" in legislation_data and legislation_data["embeddings"]:
-                cursor.execute(
-                    "DELETE FROM legislation_embeddings WHERE legislation_id = %s"
-                    if self.db_type == "postgresql"
-                    else "DELETE FROM legislation_embeddings WHERE legislation_id = ?",
-                    (legislation_id,),
-                )
-
-                for embedding_data in legislation_data["embeddings"]:
-                    embedding_id = f"{legislation_id}_s{embedding_data.get('section_idx', 0)}_c{embedding_data.get('chunk_idx', 0)}"
-                    if self.db_type == "postgresql":
-                        cursor.execute(
-                            """
-                            INSERT INTO legislation_embeddings
-                            (legislation_id, section_idx, chunk_idx, text, embedding_id)
-                            VALUES (%s, %s, %s, %s, %s)
-                            """,
-                            (
-                                legislation_id,
-                                embedding_data.get("section_idx", 0),
-                                embedding_data.get("chunk_idx", 0),
-                                embedding_data.get("text", ""),
-                                embedding_id,
-                            ),
-                        )
-                    else:
-                        cursor.execute(
-                            """
-                            INSERT INTO legislation_embeddings
-                            (legislation_id, section_idx, chunk_idx, text, embedding_id)
-                            VALUES (?, ?, ?, ?, ?)
-                            """,
-                            (
-                                legislation_id,
-                                embedding_data.get("section_idx", 0),
-                                embedding_data.get("chunk_idx", 0),
-                                embedding_data.get("text", ""),
-                                embedding_id,
-                            ),
-                        )
-
+            with self._pipeline(self.conn):
+                self._store_legislation(cursor, legislation_data)
             self.conn.commit()
             self.logger.info(f"Stored legislation: {legislation_id}")
             return True
@@ -354,61 +600,139 @@ class SQLLoader:
         finally:
             if cursor:
                 cursor.close()
+            if self.db_type == "postgresql" and self.conn:
+                self.conn.autocommit = True
 
-    def batch_store_legislation(self, legislation_list: List[Dict[str, Any]]) -> int:
+    def _store_batch(self, conn, legislation_list: List[Dict[str, Any]]) -> int:
+        """
+        Store documents on one connection in a single transaction.
+
+        A savepoint per document keeps a single bad document from discarding
+        the others.
+
+        Args:
+            conn: Connection to write on
+            legislation_list: Processed legislation documents
+
+        Returns:
+            Number of documents stored
+        """
         success_count = 0
-        for legislation in legislation_list:
-            if self.store_legislation(legislation):
-                success_count += 1
+        cursor = None
+
+        self._prepare_session(conn)
+        if self.db_type == "postgresql":
+            conn.autocommit = False
+
+        try:
+            cursor = conn.cursor()
+            if self.db_type == "sqlite":
+                cursor.execute("BEGIN")
+
+            for legislation in legislation_list:
+                if not legislation or "id" not in legislation:
+                    self.logger.error("Invalid legislation data: missing ID")
+                    continue
+
+                cursor.execute("SAVEPOINT store_legislation")
+                try:
+                    with self._pipeline(conn):
+                        self._store_legislation(cursor, legislation)
+                    cursor.execute("RELEASE SAVEPOINT store_legislation")
+                    success_count += 1
+                except Exception as e:
+                    self.logger.error(f"Error storing legislation {legislation['id']}: {str(e)}")
+                    cursor.execute("ROLLBACK TO SAVEPOINT store_legislation")
+                    cursor.execute("RELEASE SAVEPOINT store_legislation")
+
+            conn.commit()
+        except Exception as e:
+            self.logger.error(f"Error storing legislation batch: {str(e)}")
+            conn.rollback()
+            success_count = 0
+        finally:
+            if cursor:
+                cursor.close()
+            if self.db_type == "postgresql":
+                conn.autocommit = True
+
+        return success_count
+
+    def _store_batch_pooled(self, legislation_list: List[Dict[str, Any]]) -> int:
+        with self._pooled_connection() as conn:
+            return self._store_batch(conn, legislation_list)
+
+    def batch_store_legislation(self, legislation_list: List[Dict[str, Any]]) -> int:
+        if not self.conn:
+            self._connect()
+
+        workers = min(self.pool_size, len(legislation_list)) if self.db_type == "postgresql" else 1
+        if workers > 1:
+            # Split the batch across pooled connections so network round trips
+            # overlap; each worker commits its own slice
+            step = -(-len(legislation_list) // workers)
+            slices = [legislation_list[i:i + step] for i in range(0, len(legislation_list), step)]
+            with ThreadPoolExecutor(max_workers=len(slices)) as executor:
+                success_count = sum(executor.map(self._store_batch_pooled, slices))
+        else:
+            # SQLite allows a single writer, so the batch stays on one connection
+            success_count = self._store_batch(self.conn, legislation_list)
+
         self.logger.info(f"Stored {success_count}/{len(legislation_list)} legislation documents")
         return success_count
 
-    def get_legislation_by_id(self, legislation_id: str) -> Optional[Dict[str, Any]]:
+    def get_legislation_by_id(self, legislation_id: str, include_text: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get a legislation document with its sections and embedding refs.
+
+        Args:
+            legislation_id: ID of the legislation
+            include_text: Also return section and chunk text
+
+        Returns:
+            Legislation document or None if not found
+        """
         if not self.conn:
             self._connect()
         cursor = None
+        section_columns = f"{_SECTION_META_COLUMNS}, text" if include_text else _SECTION_META_COLUMNS
+        embedding_columns = f"{_EMBEDDING_META_COLUMNS}, text" if include_text else _EMBEDDING_META_COLUMNS
         try:
-            cursor = self.conn.cursor()
             if self.db_type == "postgresql":
-                cursor.execute("SELECT * FROM legislation WHERE legislation_id = %s", (legislation_id,))
-            else:
-                cursor.execute("SELECT * FROM legislation WHERE legislation_id = ?", (legislation_id,))
+                # The server returns the finished document as a single JSONB value
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    _PG_LEGISLATION_BY_ID if include_text else _PG_LEGISLATION_META_BY_ID,
+                    (legislation_id,),
+                )
+                row = cursor.fetchone()
+                return row[0] if row else None
+
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT * FROM legislation WHERE legislation_id = ?", (legislation_id,))
 
             result = cursor.fetchone()
             if not result:
                 return None
 
-            columns = [desc[0] for desc in cursor.description]
-            legislation = dict(zip(columns, result))
+            legislation = dict(result)
 
-            if self.db_type == "sqlite" and "metadata" in legislation and legislation["metadata"]:
+            if "metadata" in legislation and legislation["metadata"]:
                 legislation["metadata"] = json.loads(legislation["metadata"])
 
-            if self.db_type == "postgresql":
-                cursor.execute("SELECT * FROM legislation_sections WHERE legislation_id = %s ORDER BY section_idx", (legislation_id,))
-            else:
-                cursor.execute("SELECT * FROM legislation_sections WHERE legislation_id = ? ORDER BY section_idx", (legislation_id,))
-
-            sections = []
-            for row in cursor.fetchall():
-                section_columns = [desc[0] for desc in cursor.description]
-                section = dict(zip(section_columns, row))
-                sections.append(section)
-
-            legislation["content"] = sections
+            cursor.execute(
+                f"SELECT {section_columns} FROM legislation_sections WHERE legislation_id = ? ORDER BY section_idx",
+                (legislation_id,),
+            )
 
-            if self.db_type == "postgresql":
-                cursor.execute("SELECT * FROM legislation_embeddings WHERE legislation_id = %s ORDER BY section_idx, chunk_idx", (legislation_id,))
-            else:
-                cursor.execute("SELECT * FROM legislation_embeddings WHERE legislation_id = ? ORDER BY section_idx, chunk_idx", (legislation_id,))
+            legislation["content"] = [dict(row) for row in cursor.fetchall()]
 
-            embeddings = []
-            for row in cursor.fetchall():
-                embedding_columns = [desc[0] for desc in cursor.description]
-                embedding = dict(zip(embedding_columns, row))
-                embeddings.append(embedding)
+            cursor.execute(
+                f"SELECT {embedding_columns} FROM legislation_embeddings WHERE legislation_id = ? ORDER BY section_idx, chunk_idx",
+                (legislation_id,),
+            )
 
-            legislation["embedding_refs"] = embeddings
+            legislation["embedding_refs"] = [dict(row) for row in cursor.fetchall()]
 
             return legislation
         except Exception as e:
@@ -418,42 +742,68 @@ class SQLLoader:
             if cursor:
                 cursor.close()
 
-    def get_embedding_info(self, embedding_ids: List[str]) -> List[Dict[str, Any]]:
+    def get_section_text(self, legislation_id: str, section_idx: int) -> Optional[str]:
+        """
+        Get the text of a single section.
+
+        Args:
+            legislation_id: ID of the legislation
+            section_idx: Index of the section within the document
+
+        Returns:
+            Section text or None if not found
+        """
+        if not self.conn:
+            self._connect()
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                _PG_SECTION_TEXT if self.db_type == "postgresql" else _SQLITE_SECTION_TEXT,
+                (legislation_id, section_idx),
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            self.logger.error(f"Error retrieving section {section_idx} of {legislation_id}: {str(e)}")
+            return None
+        finally:
+            if cursor:
+                cursor.close()
+
+    def get_embedding_info(self, embedding_ids: List[str], include_text: bool = False) -> List[Dict[str, Any]]:
+        """
+        Get embedding refs with their legislation and section titles.
+
+        Args:
+            embedding_ids: IDs of the embeddings
+            include_text: Also return the chunk text
+
+        Returns:
+            Embedding info in the order of the requested IDs
+        """
         if not self.conn or not embedding_ids:
             return []
         cursor = None
         try:
-            cursor = self.conn.cursor()
-            result = []
-            for embedding_id in embedding_ids:
-                if self.db_type == "postgresql":
-                    cursor.execute(
-                        """
-                        SELECT e.*, l.title, s.section_title 
-                        FROM legislation_embeddings e
-                        JOIN legislation l ON e.legislation_id = l.legislation_id
-                        JOIN legislation_sections s ON e.legislation_id = s.legislation_id AND e.section_idx = s.section_idx
-                        WHERE e.embedding_id = %s
-                        """,
-                        (embedding_id,),
-                    )
-                else:
-                    cursor.execute(
-                        """
-                        SELECT e.*, l.title, s.section_title 
-                        FROM legislation_embeddings e
-                        JOIN legislation l ON e.legislation_id = l.legislation_id
-                        JOIN legislation_sections s ON e.legislation_id = s.legislation_id AND e.section_idx = s.section_idx
-                        WHERE e.embedding_id = ?
-                        """,
-                        (embedding_id,),
-                    )
-                row = cursor.fetchone()
-                if row:
-                    columns = [desc[0] for desc in cursor.description]
-                    embedding_info = dict(zip(columns, row))
-                    result.append(embedding_info)
-            return result
+            # One query for all ids instead of a round trip per id
+            if self.db_type == "postgresql":
+                cursor = self.conn.cursor(row_factory=dict_row)
+                cursor.execute(
+                    _PG_EMBEDDING_INFO if include_text else _PG_EMBEDDING_INFO_META,
+                    (list(embedding_ids),),
+                )
+            else:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    _SQLITE_EMBEDDING_INFO if include_text else _SQLITE_EMBEDDING_INFO_META,
+                    (_dump_json(list(embedding_ids)),),
+                )
+
+            by_id = {row["embedding_id"]: dict(row) for row in cursor.fetchall()}
+
+            # Keep the order of the requested ids
+            return [by_id[embedding_id] for embedding_id in embedding_ids if embedding_id in by_id]
         except Exception as e:
             self.logger.error(f"Error retrieving embedding info: {str(e)}")
             return []
@@ -462,7 +812,22 @@ class SQLLoader:
                 cursor.close()
 
     def close(self) -> None:
+        if self.db_type == "postgresql":
+            if self.pool:
+                if self.conn:
+                    self.pool.putconn(self.conn)
+                self.pool.close()
+                self.pool = None
+                self.conn = None
+                self._prepared.clear()
+                self.logger.info("Database connection pool closed")
+            return
+
         if self.conn:
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                self.logger.warning(f"PRAGMA optimize failed: {str(e)}")
             self.conn.close()
             self.conn = None
             self.logger.info("Database connection closed")
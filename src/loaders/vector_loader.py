@@ -1,17 +1,102 @@
 import os
+import asyncio
+import hashlib
+import itertools
 import logging
+import sys
+import threading
 import time
-import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
 try:
     import qdrant_client
+    from qdrant_client import AsyncQdrantClient
     from qdrant_client.http import models
     from qdrant_client.http.exceptions import UnexpectedResponse
     QDRANT_AVAILABLE = True
 except ImportError:
     QDRANT_AVAILABLE = False
 
+from databases.vector_init import GRPC_OPTIONS, acquire_client, create_collection, release_client
+
+
+def _base_point_id(legislation_id: str) -> int:
+    """
+    Hash a legislation ID to the 64-bit base of its point IDs.
+
+    A point ID is ``base ^ (section_idx << 20) ^ chunk_idx``, which is unique
+    within a document for fewer than 2**20 chunks per section.
+    """
+    return int.from_bytes(hashlib.blake2b(legislation_id.encode(), digest_size=8).digest(), "big")
+
+
+def _is_timeout(error: Exception) -> bool:
+    """Whether an upsert failed because the batch was too slow or too large for the server"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in (408, 413, 504)
+    code = getattr(error, "code", None)
+    if callable(code):
+        # gRPC errors carry a StatusCode enum
+        return getattr(code(), "name", None) in ("DEADLINE_EXCEEDED", "RESOURCE_EXHAUSTED")
+    return "timed out" in str(error).lower()
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether a request failed because the collection does not exist"""
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    code = getattr(error, "code", None)
+    if callable(code):
+        # gRPC errors carry a StatusCode enum
+        return getattr(code(), "name", None) == "NOT_FOUND"
+    return "not found" in str(error).lower()
+
+
+def _iter_points(legislation_id: str, embeddings: Iterable[Dict[str, Any]]) -> Iterator[Tuple[int, Any, Dict[str, Any]]]:
+    """
+    Yield ``(point_id, vector, payload)`` for each embedding; every entry must have a vector.
+
+    Points are produced lazily so the upsert loop only holds one batch at a time.
+    """
+    # Hash the legislation ID once; chunk IDs are derived from it below
+    base_id = _base_point_id(legislation_id)
+    # Every payload shares one interned ID string and the same base fields
+    legislation_id = sys.intern(legislation_id)
+    base_payload = {"legislation_id": legislation_id}
+    for embedding_data in embeddings:
+        section_idx = embedding_data.get("section_idx", 0)
+        chunk_idx = embedding_data.get("chunk_idx", 0)
+
+        # Deterministic numeric ID from the legislation hash and section/chunk
+        # indices, so re-ingesting a document overwrites its points in place
+        yield base_id ^ (section_idx << 20) ^ chunk_idx, embedding_data["vector"], {
+            **base_payload,
+            "section_idx": section_idx,
+            "section_type": embedding_data.get("section_type", ""),
+            "section_number": embedding_data.get("section_number", ""),
+            "section_title": embedding_data.get("section_title", ""),
+            "chunk_idx": chunk_idx,
+            "text": embedding_data.get("text", ""),
+        }
+
+
+
+def _build_batch(points: Iterator[Tuple[int, Any, Dict[str, Any]]], batch_size: int) -> Optional["models.Batch"]:
+    """Pull up to batch_size points into a models.Batch, or None once the iterator is exhausted"""
+    chunk = list(itertools.islice(points, batch_size))
+    if not chunk:
+        return None
+
+    # Columnar lists feed models.Batch, validated once per batch
+    # instead of once per PointStruct
+    ids, vectors, payloads = (list(column) for column in zip(*chunk))
+    del chunk
+    # Vectors (float32 rows of the cached matrix, or lists from older cache
+    # files) are passed through as they are; the model converts each row
+    # once, and gRPC sends them as packed 4-byte floats
+    return models.Batch(ids=ids, vectors=vectors, payloads=payloads)
 
 class VectorLoader:
     """
@@ -19,6 +104,13 @@ class VectorLoader:
     """
 
     COLLECTION_NAME = "legislation_embeddings"
+    UPSERT_BATCH_SIZE = 500
+    MIN_UPSERT_BATCH_SIZE = 64
+    MAX_UPSERT_BATCH_SIZE = 4096
+    # Consecutive successful batches before the batch size is doubled
+    BATCH_GROWTH_INTERVAL = 4
+    # Seconds a get_collection_info result is reused
+    INFO_CACHE_TTL = 5.0
 
     def __init__(
         self,
@@ -27,6 +119,9 @@ class VectorLoader:
         grpc_port: Optional[int] = None,
         vector_size: int = 384,
         recreate_collection: bool = False,
+        max_concurrent_batches: int = 4,
+        max_parallel_docs: int = 4,
+        quantization: bool = True,
     ):
         self.logger = logging.getLogger(__name__)
 
@@ -39,47 +134,67 @@ class VectorLoader:
         self.grpc_port = grpc_port or int(os.environ.get("VECTOR_DB_GRPC_PORT", 6334))
         self.vector_size = vector_size
         self.recreate_collection = recreate_collection
+        self.max_concurrent_batches = max_concurrent_batches
+        self.max_parallel_docs = max_parallel_docs
+        self.quantization = quantization
+
+        self._info_cache: Optional[Dict[str, Any]] = None
+        self._info_cache_ts = 0.0
 
         self.client = None
         self._connect()
         self._init_collection()
 
+        # Upserts run on a private event loop so batches can be in flight
+        # concurrently over gRPC; the async client is bound to this loop
+        self.async_client = None
+        # Upsert batch size adapts to the server across calls: it doubles after a
+        # run of successful batches and halves when a batch times out
+        self._batch_size = self.UPSERT_BATCH_SIZE
+        self._batch_successes = 0
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="vector-loader", daemon=True
+        )
+        self._loop_thread.start()
+
+    def _run(self, coro):
+        """Run a coroutine on the loader's event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _get_async_client(self) -> "AsyncQdrantClient":
+        """Get the gRPC async client, creating it on the loader's event loop"""
+        if self.async_client is None:
+            self.async_client = AsyncQdrantClient(
+                host=self.host,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=True,
+                grpc_options=GRPC_OPTIONS,
+                # One channel per concurrently stored document; each channel
+                # multiplexes that document's in-flight batches over HTTP/2
+                pool_size=self.max_parallel_docs,
+                timeout=60,
+            )
+        return self.async_client
+
     def _connect(self) -> None:
-        max_retries = 5
-        retry_delay = 2
+        # Loaders with the same connection settings share one client (and its
+        # HTTP session and gRPC channel); it is closed when the last one releases it
+        self.client = acquire_client(self.host, self.port, self.grpc_port)
 
-        for attempt in range(max_retries):
-            try:
-                self.logger.info(f"Connecting to Qdrant at {self.host}:{self.port}")
-                self.client = qdrant_client.QdrantClient(
-                    host=self.host,
-                    port=self.port,
-                    grpc_port=self.grpc_port,
-                    timeout=60,
-                )
-                self.client.get_collections()  # Test connection
-                self.logger.info("Qdrant connection established successfully")
-                break
-            except Exception as e:
-                self.logger.warning(f"Attempt {attempt + 1}/{max_retries} failed: {str(e)}")
-                if attempt < max_retries - 1:
-                    self.logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
-                    self.logger.error("Failed to connect to Qdrant after retries")
-                    raise
+    def _release_client(self) -> None:
+        release_client(self.client)
+        self.client = None
 
     def _init_collection(self) -> None:
         if not self.client:
             self.logger.error("No Qdrant connection available")
             return
 
+        self._info_cache = None
         try:
-            collections = self.client.get_collections().collections
-            collection_names = [c.name for c in collections]
-
-            if self.COLLECTION_NAME in collection_names:
+            if self.client.collection_exists(self.COLLECTION_NAME):
                 if self.recreate_collection:
                     self.logger.info(f"Recreating collection {self.COLLECTION_NAME}")
                     self.client.delete_collection(self.COLLECTION_NAME)
@@ -88,22 +203,8 @@ class VectorLoader:
                     return
 
             self.logger.info(f"Creating collection {self.COLLECTION_NAME}")
-            self.client.create_collection(
-                collection_name=self.COLLECTION_NAME,
-                vectors_config=models.VectorParams(
-                    size=self.vector_size, distance=models.Distance.COSINE
-                ),
-            )
-            self.client.create_payload_index(
-                collection_name=self.COLLECTION_NAME,
-                field_name="legislation_id",
-                field_schema=models.PayloadSchemaType.KEYWORD,
-            )
-            self.client.create_payload_index(
-                collection_name=self.COLLECTION_NAME,
-                field_name="section_idx",
-                field_schema=models.PayloadSchemaType.INTEGER,
-            )
+            create_collection(self.client, self.COLLECTION_NAME, self.vector_size, self.quantization)
+            self._info_cache = None
             self.logger.info(f"Collection {self.COLLECTION_NAME} initialized")
 
         except Exception as e:
@@ -111,9 +212,9 @@ class VectorLoader:
             raise
 
     def store_embeddings(self, legislation_data: Dict[str, Any]) -> bool:
-        if not self.client:
-            self._connect()
+        return self._run(self._store_embeddings_async(legislation_data))
 
+    async def _store_embeddings_async(self, legislation_data: Dict[str, Any]) -> bool:
         if "embeddings" not in legislation_data or not legislation_data["embeddings"]:
             self.logger.error("No embeddings found in legislation data")
             return False
@@ -123,82 +224,181 @@ class VectorLoader:
             self.logger.error("Missing legislation ID")
             return False
 
-        try:
-            self._delete_legislation_embeddings(legislation_id)
-
-            points = []
-            for embedding_data in legislation_data["embeddings"]:
-                if "vector" not in embedding_data:
-                    continue
-
-                # Use the numeric point_id from EmbeddingsGenerator if available
-                if "point_id" in embedding_data and isinstance(embedding_data["point_id"], int):
-                    point_id = embedding_data["point_id"]
-                else:
-                    # Generate a deterministic numeric ID based on the legislation ID and section/chunk indices
-                    import hashlib
-                    hash_str = f"{legislation_id}_s{embedding_data.get('section_idx', 0)}_c{embedding_data.get('chunk_idx', 0)}"
-                    hash_bytes = hashlib.md5(hash_str.encode()).digest()[:4]  # First 4 bytes
-                    point_id = int.from_bytes(hash_bytes, byteorder='big')  # Convert to integer
-
-                point = models.PointStruct(
-                    id=point_id,  # Use numeric ID
-                    vector=embedding_data["vector"],
-                    payload={
-                        "legislation_id": legislation_id,
-                        "section_idx": embedding_data.get("section_idx", 0),
-                        "section_type": embedding_data.get("section_type", ""),
-                        "section_number": embedding_data.get("section_number", ""),
-                        "section_title": embedding_data.get("section_title", ""),
-                        "chunk_idx": embedding_data.get("chunk_idx", 0),
-                        "text": embedding_data.get("text", ""),
-                        "original_id": f"{legislation_id}_s{embedding_data.get('section_idx', 0)}_c{embedding_data.get('chunk_idx', 0)}"  # Store the original ID in the payload for reference
-                    },
-                )
-                points.append(point)
-
-            batch_size = 500
-            for i in range(0, len(points), batch_size):
-                batch = points[i : i + batch_size]
-                self.client.upsert(collection_name=self.COLLECTION_NAME, points=batch)
-                self.logger.info(
-                    f"Uploaded {len(batch)} embeddings for legislation {legislation_id} (batch {i // batch_size + 1})"
-                )
+        # Drop entries without a vector up front so every point in a batch has one
+        embeddings = [e for e in legislation_data["embeddings"] if e.get("vector") is not None]
+        if not embeddings:
+            self.logger.error(f"No embedding vectors found for legislation {legislation_id}")
+            return False
 
+        try:
+            client = self._get_async_client()
+            existed = await self._has_embeddings(client, legislation_id)
+            point_ids = await self._upsert_points(client, legislation_id, _iter_points(legislation_id, embeddings))
+
+            # Point IDs are deterministic, so the upsert overwrote every chunk that
+            # still exists; only a document already in the collection can have
+            # leftover chunks, and those are removed after the new ones are in place
+            if existed:
+                await self._delete_stale_embeddings(client, legislation_id, point_ids)
             return True
 
         except Exception as e:
             self.logger.error(f"Error storing embeddings for legislation {legislation_id}: {str(e)}")
             return False
-    def _delete_legislation_embeddings(self, legislation_id: str) -> bool:
+
+    async def _upsert_points(
+        self,
+        client: "AsyncQdrantClient",
+        legislation_id: str,
+        points: Iterator[Tuple[int, Any, Dict[str, Any]]],
+    ) -> List[int]:
+        """
+        Upsert points in adaptively sized batches, pulling each batch from the iterator.
+
+        Batches are built on a worker thread and handed over through a queue of
+        two, so building the next batch overlaps with uploading earlier ones.
+        At most max_concurrent_batches upserts are in flight, which together with
+        the queue keeps memory bounded by the window rather than the document
+        size. wait=False returns once Qdrant has accepted a batch instead of
+        after indexing.
+
+        Returns:
+            IDs of the upserted points
+        """
+        loop = asyncio.get_running_loop()
+        batches: "asyncio.Queue[Optional[models.Batch]]" = asyncio.Queue(maxsize=2)
+
+        async def produce() -> None:
+            try:
+                while True:
+                    batch = await loop.run_in_executor(None, _build_batch, points, self._batch_size)
+                    if batch is None:
+                        break
+                    await batches.put(batch)
+            except Exception:
+                await batches.put(None)
+                raise
+            await batches.put(None)
+
+        point_ids = []
+        pending = set()
+        batch_number = 0
+        producer = asyncio.ensure_future(produce())
         try:
-            self.client.delete(
-                collection_name=self.COLLECTION_NAME,
-                points_selector=models.FilterSelector(
-                    filter=models.Filter(
-                        must=[
-                            models.FieldCondition(
-                                key="legislation_id",
-                                match=models.MatchValue(value=legislation_id),
-                            )
-                        ]
-                    )
-                ),
-            )
-            self.logger.info(f"Deleted existing embeddings for legislation {legislation_id}")
-            return True
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    break
+
+                if len(pending) >= self.max_concurrent_batches:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+
+                point_ids.extend(batch.ids)
+                batch_number += 1
+                pending.add(asyncio.ensure_future(
+                    self._upsert_batch(client, legislation_id, batch, batch_number)
+                ))
+
+            # Surface any error raised while building batches
+            await producer
+
+            if pending:
+                done, pending = await asyncio.wait(pending)
+                for task in done:
+                    task.result()
+        finally:
+            producer.cancel()
+            for task in pending:
+                task.cancel()
+
+        return point_ids
+
+    async def _upsert_batch(self, client: "AsyncQdrantClient", legislation_id: str, batch: "models.Batch", batch_number: int) -> None:
+        try:
+            await client.upsert(collection_name=self.COLLECTION_NAME, points=batch, wait=False)
         except Exception as e:
-            self.logger.error(f"Error deleting embeddings for legislation {legislation_id}: {str(e)}")
-            return False
+            if not _is_timeout(e) or len(batch.ids) <= self.MIN_UPSERT_BATCH_SIZE:
+                raise
+            # Back off and retry the batch in pieces of the reduced size
+            self._batch_size = max(min(self._batch_size, len(batch.ids)) // 2, self.MIN_UPSERT_BATCH_SIZE)
+            self._batch_successes = 0
+            self.logger.warning(
+                f"Upsert of {len(batch.ids)} embeddings for legislation {legislation_id} timed out; "
+                f"retrying in batches of {self._batch_size}"
+            )
+            size = self._batch_size
+            for start in range(0, len(batch.ids), size):
+                end = start + size
+                await self._upsert_batch(
+                    client,
+                    legislation_id,
+                    models.Batch(ids=batch.ids[start:end], vectors=batch.vectors[start:end], payloads=batch.payloads[start:end]),
+                    batch_number,
+                )
+            return
+
+        self._batch_successes += 1
+        if self._batch_successes >= self.BATCH_GROWTH_INTERVAL:
+            self._batch_size = min(self._batch_size * 2, self.MAX_UPSERT_BATCH_SIZE)
+            self._batch_successes = 0
+        self.logger.info(
+            f"Uploaded {len(batch.ids)} embeddings for legislation {legislation_id} (batch {batch_number})"
+        )
+
+    async def _has_embeddings(self, client: "AsyncQdrantClient", legislation_id: str) -> bool:
+        """Check whether a legislation already has points in the collection"""
+        # An exact count filtered on the indexed legislation_id is an index
+        # lookup; an estimate could miss a small document and leave stale chunks
+        result = await client.count(
+            collection_name=self.COLLECTION_NAME,
+            count_filter=models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key="legislation_id",
+                        match=models.MatchValue(value=legislation_id),
+                    )
+                ]
+            ),
+            exact=True,
+        )
+        return result.count > 0
+
+    async def _delete_stale_embeddings(self, client: "AsyncQdrantClient", legislation_id: str, point_ids: List[int]) -> None:
+        await client.delete(
+            collection_name=self.COLLECTION_NAME,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="legislation_id",
+                            match=models.MatchValue(value=legislation_id),
+                        )
+                    ],
+                    must_not=[models.HasIdCondition(has_id=point_ids)],
+                )
+            ),
+        )
+        self.logger.info(f"Deleted stale embeddings for legislation {legislation_id}")
 
     def batch_store_embeddings(self, legislation_list: List[Dict[str, Any]]) -> int:
-        success_count = 0
-        for legislation in legislation_list:
-            if self.store_embeddings(legislation):
-                success_count += 1
+        success_count = self._run(self._batch_store_embeddings_async(legislation_list))
         self.logger.info(f"Stored embeddings for {success_count}/{len(legislation_list)} legislation documents")
         return success_count
 
+    async def _batch_store_embeddings_async(self, legislation_list: List[Dict[str, Any]]) -> int:
+        # Documents share the async client and overlap their network round trips;
+        # each still succeeds or fails on its own
+        semaphore = asyncio.Semaphore(self.max_parallel_docs)
+
+        async def store(legislation: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self._store_embeddings_async(legislation)
+
+        results = await asyncio.gather(*(store(legislation) for legislation in legislation_list))
+        return sum(1 for stored in results if stored)
+
     def search(
         self,
         query_vector: List[float],
@@ -230,27 +430,38 @@ class VectorLoader:
             if filter_conditions:
                 search_filter = models.Filter(must=filter_conditions)
 
-            search_results = self.client.search(
+            # query_points has a gRPC implementation, so searches share the
+            # protobuf path used for upserts instead of falling back to REST
+            search_results = self.client.query_points(
                 collection_name=self.COLLECTION_NAME,
-                query_vector=query_vector,
+                query=query_vector,
                 limit=limit,
                 with_payload=True,
-                filter=search_filter,
-            )
+                query_filter=search_filter,
+                search_params=models.SearchParams(
+                    quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+                ),
+            ).points
 
             results = []
             for result in search_results:
+                payload = result.payload
+                legislation_id = payload.get("legislation_id")
+                section_idx = payload.get("section_idx")
+                chunk_idx = payload.get("chunk_idx")
                 results.append(
                     {
-                        "embedding_id": result.id,
+                        # Same ID the SQL loader stores for the chunk, rebuilt from the payload
+                        "embedding_id": f"{legislation_id}_s{section_idx}_c{chunk_idx}",
+                        "point_id": result.id,
                         "score": result.score,
-                        "legislation_id": result.payload.get("legislation_id"),
-                        "section_idx": result.payload.get("section_idx"),
-                        "section_type": result.payload.get("section_type"),
-                        "section_number": result.payload.get("section_number"),
-                        "section_title": result.payload.get("section_title"),
-                        "chunk_idx": result.payload.get("chunk_idx"),
-                        "text": result.payload.get("text"),
+                        "legislation_id": legislation_id,
+                        "section_idx": section_idx,
+                        "section_type": payload.get("section_type"),
+                        "section_number": payload.get("section_number"),
+                        "section_title": payload.get("section_title"),
+                        "chunk_idx": chunk_idx,
+                        "text": payload.get("text"),
                     }
                 )
 
@@ -275,30 +486,12 @@ class VectorLoader:
                     ]
                 )
 
-            if search_filter:
-                count = 0
-                batch_size = 1000
-                offset = None
-
-                while True:
-                    scroll_response = self.client.scroll(
-                        collection_name=self.COLLECTION_NAME,
-                        filter=search_filter,
-                        limit=batch_size,
-                        offset=offset,
-                        with_payload=False,
-                        with_vectors=False,
-                    )
-                    batch_points, offset = scroll_response
-                    count += len(batch_points)
-
-                    if not offset:
-                        break
-
-                return count
-            else:
-                collection_info = self.client.get_collection(self.COLLECTION_NAME)
-                return collection_info.vectors_count
+            # Counted server-side; an approximate count is enough for reporting
+            return self.client.count(
+                collection_name=self.COLLECTION_NAME,
+                count_filter=search_filter,
+                exact=False,
+            ).count
 
         except Exception as e:
             self.logger.error(f"Error counting embeddings: {str(e)}")
@@ -308,24 +501,40 @@ class VectorLoader:
         if not self.client:
             self._connect()
 
+        # Collection metadata rarely changes, so serve repeated calls from a short-lived cache
+        now = time.monotonic()
+        if self._info_cache is not None and now - self._info_cache_ts < self.INFO_CACHE_TTL:
+            return self._info_cache
+
         try:
             collection_info = self.client.get_collection(self.COLLECTION_NAME)
 
-            return {
-                "name": collection_info.name,
-                "vectors_count": collection_info.vectors_count,
+            self._info_cache = {
+                "name": self.COLLECTION_NAME,
+                "vectors_count": getattr(collection_info, "vectors_count", None),
                 "points_count": collection_info.points_count,
                 "vector_size": collection_info.config.params.vectors.size,
                 "distance": str(collection_info.config.params.vectors.distance),
                 "status": "ready",
             }
-        except UnexpectedResponse:
-            return {"name": self.COLLECTION_NAME, "status": "not_found"}
+            self._info_cache_ts = now
+            return self._info_cache
         except Exception as e:
+            # Only "ready" results are cached, so a missing collection is seen as
+            # soon as _init_collection creates it
+            if _is_not_found(e):
+                return {"name": self.COLLECTION_NAME, "status": "not_found"}
             self.logger.error(f"Error getting collection info: {str(e)}")
             return {"name": self.COLLECTION_NAME, "status": "error", "error": str(e)}
 
     def close(self) -> None:
+        if self._loop.is_running():
+            if self.async_client is not None:
+                self._run(self.async_client.close())
+                self.async_client = None
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
         if self.client:
-            self.client = None
+            self._release_client()
             self.logger.info("Vector database connection closed")
@@ -1,28 +1,80 @@
 #!/usr/bin/env python3
 import os
 import sys
+import json
 import time
+import asyncio
 import logging
 import argparse
+import multiprocessing
 import concurrent.futures
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+import numpy as np
+
 # Import utility modules
 from utils.config import Config
 from utils.logging import setup_logging
 from utils.checkpoint import CheckpointManager
 
-# Import database initialization modules
-from databases.sql_init import init_sql_database
-from databases.vector_init import init_vector_database
+# Cleaning worker processes re-import this module, so the database clients, the
+# scraper and the embedding stack are imported where the pipeline builds them
+from text_transformers.cleaner import clean_raw_file
+
+# orjson reads and writes the pipeline's JSON files in C when available
+try:
+    import orjson
+
+    def _read_json(path: str) -> Any:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    def _write_json(path: str, data: Any) -> None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+except ImportError:
+    def _read_json(path: str) -> Any:
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _write_json(path: str, data: Any) -> None:
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+
+def _list_json_files(directory: str) -> List[str]:
+    """List the paths of the JSON files in a directory"""
+    # scandir reports the entry type without a separate stat per file
+    with os.scandir(directory) as entries:
+        return [entry.path for entry in entries if entry.name.endswith('.json') and entry.is_file()]
+
+
+def _write_embedded(path: str, data: Dict[str, Any]) -> None:
+    """
+    Write legislation data with embeddings as JSON plus a float32 .npy matrix.
+    
+    Row i of the matrix is the vector of embeddings[i]; the JSON keeps
+    everything else, so vectors never go through text serialization.
+    """
+    embeddings = data.get('embeddings') or []
+    vectors = np.asarray([embedding['vector'] for embedding in embeddings], dtype=np.float32)
+    np.save(os.path.splitext(path)[0] + '.npy', vectors)
+    _write_json(path, {
+        **data,
+        'embeddings': [{k: v for k, v in embedding.items() if k != 'vector'} for embedding in embeddings],
+    })
+
 
-# Import ETL components
-from extractors.legislation_scraper import LegislationScraper
-from text_transformers.cleaner import LegislationCleaner
-from text_transformers.embeddings import EmbeddingsGenerator
-from loaders.sql_loader import SQLLoader
-from loaders.vector_loader import VectorLoader
+def _read_embedded(path: str) -> Dict[str, Any]:
+    """Read legislation data written by _write_embedded, reattaching each vector"""
+    data = _read_json(path)
+    vectors_path = os.path.splitext(path)[0] + '.npy'
+    # Files from before the .npy split carry their vectors inline
+    if os.path.exists(vectors_path):
+        for embedding, vector in zip(data.get('embeddings') or [], np.load(vectors_path)):
+            embedding['vector'] = vector
+    return data
 
 
 class ETLPipeline:
@@ -66,13 +118,17 @@ class ETLPipeline:
         
     def _init_components(self) -> None:
         """Initialize ETL pipeline components."""
+        from extractors.legislation_scraper import LegislationScraper
+        from text_transformers.embeddings import EmbeddingsGenerator
+        from loaders.sql_loader import SQLLoader
+        from loaders.vector_loader import VectorLoader
+        
         # Initialize extractor
         self.scraper = LegislationScraper(
             cache_dir=self.config.get("cache_dir", "/data/cache")
         )
         
-        # Initialize transformers
-        self.cleaner = LegislationCleaner()
+        # Initialize transformers (cleaning runs in the transform phase's worker processes)
         self.embeddings_generator = EmbeddingsGenerator(
             batch_size=self.config.get("batch_size", 64),
             max_seq_length=self.config.get("max_seq_length", 256),
@@ -103,6 +159,9 @@ class ETLPipeline:
         Returns:
             True if successful, False otherwise
         """
+        from databases.sql_init import init_sql_database
+        from databases.vector_init import init_vector_database
+        
         self.logger.info("Initializing databases")
         
         # Initialize SQL database
@@ -135,6 +194,18 @@ class ETLPipeline:
         self.logger.info("Databases initialized successfully")
         return True
         
+    def close(self) -> None:
+        """Close the scraper and loaders, releasing their connections and worker threads."""
+        self.scraper.close()
+        self.sql_loader.close()
+        self.vector_loader.close()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
     def run(self) -> bool:
         """
         Run the ETL pipeline.
@@ -162,21 +233,26 @@ class ETLPipeline:
         # Get current stage from checkpoint if available
         current_stage = self.checkpoint_manager.state.get("current_stage")
         
+        # Each phase hands its output files to the next; a phase resumed from a
+        # checkpoint without its predecessor discovers them on disk instead
+        raw_files = None
+        embedded_files = None
+        
         try:
             # EXTRACT phase
             if not current_stage or current_stage == "extract":
                 self.checkpoint_manager.update_stage("extract")
-                self._run_extract_phase(time_period, category, batch_size, max_items)
+                raw_files = self._run_extract_phase(time_period, category, batch_size, max_items)
             
             # TRANSFORM phase
             if not current_stage or current_stage in ["extract", "transform"]:
                 self.checkpoint_manager.update_stage("transform")
-                self._run_transform_phase(max_workers)
+                embedded_files = self._run_transform_phase(max_workers, raw_files)
             
             # LOAD phase
             if not current_stage or current_stage in ["extract", "transform", "load"]:
                 self.checkpoint_manager.update_stage("load")
-                self._run_load_phase()
+                self._run_load_phase(max_workers, embedded_files)
             
             # Pipeline complete
             self.checkpoint_manager.update_stage("complete")
@@ -202,7 +278,7 @@ class ETLPipeline:
                          time_period: str, 
                          category: str, 
                          batch_size: int,
-                         max_items: Optional[int]) -> None:
+                         max_items: Optional[int]) -> List[str]:
         """
         Run the Extract phase of the ETL pipeline.
         
@@ -211,6 +287,9 @@ class ETLPipeline:
             category: Category of legislation
             batch_size: Size of batches to process
             max_items: Maximum number of items to process
+            
+        Returns:
+            Paths of the raw legislation files for this run
         """
         self.logger.info("Starting Extract phase")
         
@@ -232,7 +311,39 @@ class ETLPipeline:
         # Update stats
         self.checkpoint_manager.update_stats("total_items", len(search_results))
         
-        # Process in batches
+        # Fetch every batch on one event loop
+        raw_files = asyncio.run(self._extract_batches(search_results, batch_size, processed_ids, raw_data_dir))
+        
+        # Items fetched by an interrupted earlier run still need transforming
+        fetched = set(raw_files)
+        for legislation_id in processed_ids:
+            raw_data_path = os.path.join(raw_data_dir, f"{legislation_id}.json")
+            if raw_data_path not in fetched and os.path.exists(raw_data_path):
+                raw_files.append(raw_data_path)
+        
+        self.logger.info(f"Extract phase completed. Processed {self.checkpoint_manager.get_processed_count()} items")
+        return raw_files
+    
+    async def _extract_batches(self,
+                               search_results: List[Dict[str, Any]],
+                               batch_size: int,
+                               processed_ids: set,
+                               raw_data_dir: str) -> List[str]:
+        """
+        Fetch legislation content batch by batch and save it to the raw cache.
+        
+        Args:
+            search_results: Legislation metadata from the search
+            batch_size: Size of batches to process
+            processed_ids: IDs already processed in an earlier run
+            raw_data_dir: Directory for raw legislation data
+            
+        Returns:
+            Paths of the raw legislation files written
+        """
+        raw_files = []
+        max_concurrent = self.config.get("max_concurrent_fetches", self.scraper.MAX_CONCURRENT_LEGISLATION)
+        
         for i in range(0, len(search_results), batch_size):
             batch = search_results[i:i+batch_size]
             self.logger.info(f"Processing batch {i//batch_size + 1}/{(len(search_results)-1)//batch_size + 1} ({len(batch)} items)")
@@ -245,187 +356,182 @@ class ETLPipeline:
                 "end_index": i + len(batch)
             })
             
-            # Fetch legislation content
-            for item in batch:
-                item_id = item.get('id')
-                
-                # Skip if already processed
-                if item_id in processed_ids:
-                    self.logger.debug(f"Skipping already processed item: {item_id}")
+            # Skip items already processed
+            pending = [item for item in batch if item.get('id') not in processed_ids]
+            if len(pending) < len(batch):
+                self.logger.debug(f"Skipping {len(batch) - len(pending)} already processed items")
+            
+            # Fetch legislation content concurrently
+            results = await self.scraper.fetch_legislation_batch_async(pending, max_concurrent)
+            
+            for item, legislation_data in zip(pending, results):
+                if not legislation_data:
                     continue
                 
                 try:
-                    # Fetch content
-                    legislation_data = self.scraper.fetch_legislation_content(item)
+                    # Ensure 'id' is set
+                    if 'id' not in legislation_data:
+                        legislation_data['id'] = legislation_data.get('legislation_id') or item.get('id')  # fallback to scraped id
+                    # Save raw data to cache
+                    raw_data_path = os.path.join(raw_data_dir, f"{legislation_data['id']}.json")
+                    _write_json(raw_data_path, legislation_data)
+                    raw_files.append(raw_data_path)
                     
-                    if legislation_data:
-                        # Ensure 'id' is set
-                        if 'id' not in legislation_data:
-                            legislation_data['id'] = legislation_data.get('legislation_id') or item.get('id')  # fallback to scraped id
-                        # Save raw data to cache
-                        raw_data_path = os.path.join(raw_data_dir, f"{legislation_data['id']}.json")
-                        with open(raw_data_path, 'w') as f:
-                            import json
-                            json.dump(legislation_data, f)
-                        
-                        # Mark as processed
-                        self.checkpoint_manager.mark_processed(legislation_data['id'])
+                    # Mark as processed
+                    self.checkpoint_manager.mark_processed(legislation_data['id'])
                     
                 except Exception as e:
-                    self.logger.error(f"Error fetching legislation {item_id}: {str(e)}")
+                    self.logger.error(f"Error saving legislation {item.get('id')}: {str(e)}")
         
-        self.logger.info(f"Extract phase completed. Processed {self.checkpoint_manager.get_processed_count()} items")
+        return raw_files
     
-    def _run_transform_phase(self, max_workers: int) -> None:
+    def _run_transform_phase(self, max_workers: int, raw_files: Optional[List[str]] = None) -> List[str]:
         """
         Run the Transform phase of the ETL pipeline.
         
         Args:
             max_workers: Maximum number of workers for parallel processing
+            raw_files: Paths of raw legislation files from the Extract phase
+                (None to transform every file in the raw cache)
+            
+        Returns:
+            Paths of the embedded legislation files written
         """
         self.logger.info("Starting Transform phase")
         
         # Create directories for transformed data
         raw_data_dir = os.path.join(self.config.get("cache_dir", "/data/cache"), "raw")
-        clean_data_dir = os.path.join(self.config.get("cache_dir", "/data/cache"), "clean")
         embedded_data_dir = os.path.join(self.config.get("cache_dir", "/data/cache"), "embedded")
         
-        os.makedirs(clean_data_dir, exist_ok=True)
         os.makedirs(embedded_data_dir, exist_ok=True)
         
         # Get list of raw data files
-        raw_files = [f for f in os.listdir(raw_data_dir) if f.endswith('.json')]
+        if raw_files is None:
+            raw_files = _list_json_files(raw_data_dir)
         self.logger.info(f"Found {len(raw_files)} raw legislation files to transform")
         
-        # Process files in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Clean data
-            self.logger.info("Cleaning legislation data")
-            clean_futures = {executor.submit(self._clean_legislation, os.path.join(raw_data_dir, f), clean_data_dir): f for f in raw_files}
-            
-            for future in concurrent.futures.as_completed(clean_futures):
-                file = clean_futures[future]
-                try:
-                    result = future.result()
-                    if result:
-                        self.logger.debug(f"Cleaned legislation: {file}")
-                except Exception as e:
-                    self.logger.error(f"Error cleaning legislation {file}: {str(e)}")
-            
-            # Generate embeddings
-            self.logger.info("Generating embeddings")
-            clean_files = [f for f in os.listdir(clean_data_dir) if f.endswith('.json')]
-            
-            embedding_futures = {executor.submit(self._generate_embeddings, os.path.join(clean_data_dir, f), embedded_data_dir): f for f in clean_files}
-            
-            for future in concurrent.futures.as_completed(embedding_futures):
-                file = embedding_futures[future]
-                try:
-                    result = future.result()
-                    if result:
-                        self.logger.debug(f"Generated embeddings for legislation: {file}")
-                except Exception as e:
-                    self.logger.error(f"Error generating embeddings for {file}: {str(e)}")
+        # Cleaning and embedding are fused: each raw file is cleaned in memory and
+        # handed straight to the embedder, and only the embedded output is written.
+        # Cleaning is CPU-bound Python, so it runs in worker processes; embedding
+        # stays in this process with the model. Workers are not forked from this
+        # process, which already runs loader threads and may hold a CUDA context;
+        # they fork from a fresh forkserver that only imports the cleaner, so each
+        # worker does not re-import main.py and the embedding stack.
+        clean_workers = self.config.get("clean_workers", min(os.cpu_count() or 1, 8))
+        clean_context = multiprocessing.get_context("forkserver")
+        clean_context.set_forkserver_preload(["text_transformers.cleaner"])
+        with concurrent.futures.ProcessPoolExecutor(max_workers=clean_workers, mp_context=clean_context) as clean_executor, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Chunks from a group of files go through the model together, so the
+            # GPU sees large batches instead of one small batch per file
+            files_per_batch = self.config.get("embedding_files_per_batch", 64)
+            groups = [raw_files[i:i+files_per_batch] for i in range(0, len(raw_files), files_per_batch)]
+            embedded_files = []
+            # map() submits eagerly, so the next group is cleaned while this one is embedded
+            pending = clean_executor.map(clean_raw_file, groups[0]) if groups else None
+            for i, raw_paths in enumerate(groups):
+                cleaned = list(pending)
+                if i + 1 < len(groups):
+                    pending = clean_executor.map(clean_raw_file, groups[i + 1])
+                written = self._transform_batch(raw_paths, cleaned, embedded_data_dir, executor)
+                embedded_files.extend(written)
+                self.logger.debug(f"Transformed {len(written)}/{len(raw_paths)} legislation files")
         
         self.logger.info("Transform phase completed")
+        return embedded_files
     
-    def _clean_legislation(self, raw_file_path: str, output_dir: str) -> bool:
+    def _transform_batch(self,
+                         raw_file_paths: List[str],
+                         cleaned_data: List[Optional[Dict[str, Any]]],
+                         output_dir: str,
+                         executor: concurrent.futures.Executor) -> List[str]:
         """
-        Clean legislation data and save to output directory.
+        Embed a group of cleaned legislation files in one bulk pass.
         
         Args:
-            raw_file_path: Path to raw legislation data file
-            output_dir: Output directory for cleaned data
+            raw_file_paths: Paths to raw legislation data files
+            cleaned_data: Cleaned data for each raw file (None where cleaning failed)
+            output_dir: Output directory for data with embeddings
+            executor: Executor used to write the files in parallel
             
         Returns:
-            True if successful, False otherwise
+            Paths of the files written with embeddings
         """
-        try:
-            # Load raw data
-            with open(raw_file_path, 'r') as f:
-                import json
-                legislation_data = json.load(f)
-            
-            # Clean data
-            cleaned_data = self.cleaner.clean(legislation_data)
-            
-            # Save cleaned data
-            output_path = os.path.join(output_dir, os.path.basename(raw_file_path))
-            with open(output_path, 'w') as f:
-                json.dump(cleaned_data, f, indent=2)
-            
-            return True
-        except Exception as e:
-            self.logger.error(f"Error cleaning legislation {raw_file_path}: {str(e)}")
-            return False
+        cleaned = [
+            (path, data)
+            for path, data in zip(raw_file_paths, cleaned_data)
+            if data is not None
+        ]
+        if not cleaned:
+            return []
+        
+        # Generate embeddings for all files' chunks together
+        embedding_chunk_size = self.config.get("embedding_chunk_size", 200)
+        self.embeddings_generator.batch_process_legislation(
+            [data for _, data in cleaned],
+            chunk_size=embedding_chunk_size
+        )
+        
+        def save(path: str, data: Dict[str, Any]) -> Optional[str]:
+            try:
+                output_path = os.path.join(output_dir, os.path.basename(path))
+                _write_embedded(output_path, data)
+                return output_path
+            except Exception as e:
+                self.logger.error(f"Error generating embeddings for {path}: {str(e)}")
+                return None
+        
+        return [output_path for output_path in executor.map(lambda item: save(*item), cleaned) if output_path]
     
-    def _generate_embeddings(self, clean_file_path: str, output_dir: str) -> bool:
+    def _run_load_phase(self, max_workers: int, embedded_files: Optional[List[str]] = None) -> None:
         """
-        Generate embeddings for legislation data and save to output directory.
+        Run the Load phase of the ETL pipeline.
         
         Args:
-            clean_file_path: Path to cleaned legislation data file
-            output_dir: Output directory for data with embeddings
-            
-        Returns:
-            True if successful, False otherwise
+            max_workers: Maximum number of workers for parallel processing
+            embedded_files: Paths of embedded legislation files from the Transform
+                phase (None to load every file in the embedded cache)
         """
-        try:
-            # Load cleaned data
-            with open(clean_file_path, 'r') as f:
-                import json
-                cleaned_data = json.load(f)
-            
-            # Generate embeddings
-            embedding_chunk_size = self.config.get("embedding_chunk_size", 200)
-            data_with_embeddings = self.embeddings_generator.generate_embeddings(
-                cleaned_data, 
-                chunk_size=embedding_chunk_size
-            )
-            
-            # Save data with embeddings
-            output_path = os.path.join(output_dir, os.path.basename(clean_file_path))
-            with open(output_path, 'w') as f:
-                json.dump(data_with_embeddings, f, indent=2)
-            
-            return True
-        except Exception as e:
-            self.logger.error(f"Error generating embeddings for {clean_file_path}: {str(e)}")
-            return False
-    
-    def _run_load_phase(self) -> None:
-        """Run the Load phase of the ETL pipeline."""
         self.logger.info("Starting Load phase")
         
         # Get embedded data files
-        embedded_data_dir = os.path.join(self.config.get("cache_dir", "/data/cache"), "embedded")
-        embedded_files = [f for f in os.listdir(embedded_data_dir) if f.endswith('.json')]
+        if embedded_files is None:
+            embedded_files = _list_json_files(os.path.join(self.config.get("cache_dir", "/data/cache"), "embedded"))
         
         self.logger.info(f"Found {len(embedded_files)} embedded legislation files to load")
         
-        # Process each file
-        success_count = 0
-        for file in embedded_files:
+        def load(file: str) -> Optional[Dict[str, Any]]:
             try:
                 # Load data with embeddings
-                with open(os.path.join(embedded_data_dir, file), 'r') as f:
-                    import json
-                    legislation_data = json.load(f)
-                
-                # Store in SQL database
-                sql_success = self.sql_loader.store_legislation(legislation_data)
+                return _read_embedded(file)
+            except Exception as e:
+                self.logger.error(f"Error loading legislation {file}: {str(e)}")
+                return None
+        
+        # Load files in batches so each store is a bulk write (COPY / pipelined
+        # upserts for SQL, concurrent gRPC upserts for vectors) instead of one
+        # round trip per document
+        load_batch_size = self.config.get("load_batch_size", 100)
+        success_count = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i in range(0, len(embedded_files), load_batch_size):
+                batch_files = embedded_files[i:i+load_batch_size]
+                legislation_list = [data for data in executor.map(load, batch_files) if data is not None]
                 
-                # Store embeddings in vector database
-                vector_success = self.vector_loader.store_embeddings(legislation_data)
+                if not legislation_list:
+                    continue
                 
-                if sql_success and vector_success:
-                    success_count += 1
-                    self.logger.debug(f"Successfully loaded legislation: {file}")
-                else:
-                    self.logger.warning(f"Partial failure loading legislation: {file} - SQL: {sql_success}, Vector: {vector_success}")
+                # The SQL store spreads the batch over its pooled connections (one
+                # per worker) while the vector store runs on its own event loop, so
+                # both databases are written at the same time
+                sql_future = executor.submit(self.sql_loader.batch_store_legislation, legislation_list)
+                vector_count = self.vector_loader.batch_store_embeddings(legislation_list)
+                sql_count = sql_future.result()
                 
-            except Exception as e:
-                self.logger.error(f"Error loading legislation {file}: {str(e)}")
+                # Each store reports its own count; the smaller bounds the documents in both
+                success_count += min(sql_count, vector_count)
+                if sql_count < len(legislation_list) or vector_count < len(legislation_list):
+                    self.logger.warning(f"Partial failure loading batch of {len(legislation_list)} legislation files - SQL: {sql_count}, Vector: {vector_count}")
         
         self.logger.info(f"Load phase completed. Successfully loaded {success_count}/{len(embedded_files)} items")
         
@@ -440,8 +546,8 @@ def main():
     args = parser.parse_args()
     
     # Run pipeline
-    pipeline = ETLPipeline(config_path=args.config)
-    success = pipeline.run()
+    with ETLPipeline(config_path=args.config) as pipeline:
+        success = pipeline.run()
     
     # Exit with appropriate status code
     sys.exit(0 if success else 1)
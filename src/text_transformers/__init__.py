@@ -1,4 +1,12 @@
 from .cleaner import LegislationCleaner
-from .embeddings import EmbeddingsGenerator
 
-__all__ = ['LegislationCleaner', 'EmbeddingsGenerator']
\ No newline at end of file
+__all__ = ['LegislationCleaner', 'EmbeddingsGenerator']
+
+
+def __getattr__(name):
+    # Loaded on first use so importing the cleaner (as the cleaning worker
+    # processes do) does not also import torch and sentence-transformers
+    if name == 'EmbeddingsGenerator':
+        from .embeddings import EmbeddingsGenerator
+        return EmbeddingsGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,7 @@
 import os
 import logging
 import numpy as np
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from sentence_transformers import SentenceTransformer
 import re
 import torch
@@ -22,6 +22,8 @@ class EmbeddingsGenerator:
         max_seq_length: int = 256,
         device: Optional[str] = None,
         use_progress_bar: bool = True,
+        bulk_batch_size: int = 256,
+        use_bf16: Optional[bool] = None,
     ) -> None:
         """
         Initialize the embeddings generator.
@@ -31,11 +33,14 @@ class EmbeddingsGenerator:
             max_seq_length: Maximum sequence length for the model
             device: Device to use for computation ('cuda', 'cpu', or None for auto-detection)
             use_progress_bar: Whether to show progress bar during embedding generation
+            bulk_batch_size: Batch size when embedding chunks gathered from many documents
+            use_bf16: Run the model in bfloat16 (None to enable it on GPUs that support it)
         """
         self.logger = logging.getLogger(__name__)
         self.batch_size = batch_size
         self.max_seq_length = max_seq_length
         self.use_progress_bar = use_progress_bar
+        self.bulk_batch_size = bulk_batch_size
 
         if device is None:
             device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -43,10 +48,17 @@ class EmbeddingsGenerator:
         self.device = device
         self.logger.info(f"Using device: {self.device} for embeddings generation")
 
+        if use_bf16 is None:
+            use_bf16 = device.startswith("cuda") and torch.cuda.is_bf16_supported()
+        self.use_bf16 = use_bf16
+
         try:
             self.model = SentenceTransformer(self.MODEL_NAME, device=device)
             self.model.max_seq_length = max_seq_length
-            self.logger.info(f"Loaded model: {self.MODEL_NAME}")
+            if self.use_bf16:
+                # Native bf16 weights halve memory traffic without per-op autocast
+                self.model.to(torch.bfloat16)
+            self.logger.info(f"Loaded model: {self.MODEL_NAME}{' (bfloat16)' if self.use_bf16 else ''}")
         except Exception as e:
             self.logger.error(f"Error loading model {self.MODEL_NAME}: {str(e)}")
             raise
@@ -86,77 +98,107 @@ class EmbeddingsGenerator:
 
         return chunks
 
-    def _generate_chunk_embeddings(self, chunks: List[str]) -> List[np.ndarray]:
-        all_embeddings: List[np.ndarray] = []
+    def generate_embeddings_bulk(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a flat list of texts in large batches.
+
+        Args:
+            texts: Texts to embed, typically chunks gathered from many documents
 
-        iterator = range(0, len(chunks), self.batch_size)
-        if self.use_progress_bar:
+        Returns:
+            Array of unit-normalized embeddings, one row per text
+        """
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        return self._encode(texts, self.bulk_batch_size, show_progress_bar=self.use_progress_bar)
+
+    def _encode(self, texts: List[str], batch_size: int, show_progress_bar: bool = False) -> np.ndarray:
+        """Encode texts and return float32 unit vectors"""
+        # Tokenize everything in one call; the fast tokenizer's setup cost is paid once
+        features = self.model.tokenize(texts)
+        lengths = features["attention_mask"].sum(dim=1)
+        # Longest first, so each batch is trimmed to its own longest text
+        order = torch.argsort(lengths, descending=True)
+
+        embeddings = torch.empty(
+            (len(texts), self.model.get_sentence_embedding_dimension()),
+            dtype=torch.float32,
+            device=self.device,
+        )
+        iterator = range(0, len(texts), batch_size)
+        if show_progress_bar:
             iterator = tqdm(iterator, desc="Generating embeddings")
 
-        for i in iterator:
-            batch = chunks[i : i + self.batch_size]
-            with torch.no_grad():
-                batch_embeddings = self.model.encode(batch, convert_to_numpy=True)
-
-            # Normalize embeddings to unit vectors (for cosine similarity)
-            norms = np.linalg.norm(batch_embeddings, axis=1, keepdims=True)
-            batch_embeddings = batch_embeddings / np.clip(norms, a_min=1e-10, a_max=None)
-
-            all_embeddings.extend(batch_embeddings)
-
-        return all_embeddings
-
-    # def generate_embeddings(
-    #     self, legislation_data: Dict[str, Any], chunk_size: int = 200
-    # ) -> Dict[str, Any]:
-    #     """
-    #     Generate embeddings for the given legislation data.
-
-    #     """
-    #     if "content" not in legislation_data:
-    #         self.logger.error("Missing content in legislation data")
-    #         return legislation_data
-
-    #     try:
-    #         legislation_data["embeddings"] = []
-
-    #         for section_idx, section in enumerate(legislation_data["content"]):
-    #             section_text = section.get("text", "")
-    #             if not section_text:
-    #                 continue
-
-    #             text_chunks = self._split_text_into_chunks(section_text, chunk_size)
-    #             chunk_embeddings = self._generate_chunk_embeddings(text_chunks)
-
-    #             for chunk_idx, (chunk, embedding) in enumerate(zip(text_chunks, chunk_embeddings)):
-    #                 # Ensure point ID is a valid unsigned integer
-    #                 point_id = point_id_counter
-    #                 point_id_counter += 1
-
-
-    #                 embedding_data = {
-    #                     "section_idx": section_idx,
-    #                     "section_type": section.get("section_type", ""),
-    #                     "section_number": section.get("section_number", ""),
-    #                     "section_title": section.get("section_title", ""),
-    #                     "chunk_idx": chunk_idx,
-    #                     "text": chunk,
-    #                     "vector": embedding.tolist(),
-    #                     "point_id": point_id,  # Use the fixed point_id here
-    #                     "metadata": {
-    #                     "legislation_id": legislation_data.get("id", ""),
-    #                     "section_idx": section_idx,
-    #                     "chunk_idx": chunk_idx
-    #                     }
-    #                 }
-    #                 legislation_data["embeddings"].append(embedding_data)
-
-    #         self.logger.info(f"Generated {len(legislation_data['embeddings'])} embeddings")
-    #         return legislation_data
-
-    #     except Exception as e:
-    #         self.logger.error(f"Error generating embeddings: {str(e)}")
-    #         return legislation_data
+        with torch.inference_mode():
+            for start in iterator:
+                batch_idx = order[start : start + batch_size]
+                width = int(lengths[batch_idx[0]])
+                batch = {
+                    key: value[batch_idx, :width].to(self.device)
+                    for key, value in features.items()
+                }
+                embeddings[batch_idx.to(self.device)] = self._forward(batch)
+
+            embeddings = torch.nn.functional.normalize(embeddings, dim=-1)
+        return embeddings.cpu().numpy()
+
+    def _forward(self, features: Dict[str, Any]) -> "torch.Tensor":
+        """Run the model on one tokenized batch and return its float32 sentence embeddings"""
+        # Only the transformer runs in the model's dtype; its token embeddings are
+        # upcast before pooling so bf16 weights do not also mean bf16 averaging
+        modules = list(self.model)
+        features = modules[0](features)
+        features["token_embeddings"] = features["token_embeddings"].float()
+        for module in modules[1:]:
+            features = module(features)
+        return features["sentence_embedding"].float()
+
+    def _chunk_sections(
+        self, legislation_data: Dict[str, Any], chunk_size: int
+    ) -> List[Tuple[int, Dict[str, Any], int, str]]:
+        """Split every section into chunks as (section_idx, section, chunk_idx, text)"""
+        legislation_id = legislation_data.get("id", "unknown_id")
+        chunks = []
+        for section_idx, section in enumerate(legislation_data["content"]):
+            section_text = section.get("text", "")
+            if not section_text:
+                self.logger.warning(f"Empty text in section {section_idx} for legislation: {legislation_id}")
+                continue
+
+            text_chunks = self._split_text_into_chunks(section_text, chunk_size)
+            self.logger.debug(f"Split section {section_idx} into {len(text_chunks)} chunks")
+            chunks.extend(
+                (section_idx, section, chunk_idx, chunk) for chunk_idx, chunk in enumerate(text_chunks)
+            )
+        return chunks
+
+    def _attach_embeddings(
+        self,
+        legislation_data: Dict[str, Any],
+        chunks: List[Tuple[int, Dict[str, Any], int, str]],
+        vectors: np.ndarray,
+    ) -> None:
+        legislation_id = legislation_data.get("id", "unknown_id")
+        legislation_data["embeddings"] = [
+            {
+                "section_idx": section_idx,
+                "section_type": section.get("section_type", ""),
+                "section_number": section.get("section_number", ""),
+                "section_title": section.get("section_title", ""),
+                "chunk_idx": chunk_idx,
+                "text": chunk,
+                "vector": vector,
+                # Add metadata for search/filtering if needed
+                "metadata": {
+                    "legislation_id": legislation_id,
+                    "section_idx": section_idx,
+                    "chunk_idx": chunk_idx
+                }
+            }
+            for (section_idx, section, chunk_idx, chunk), vector in zip(chunks, vectors)
+        ]
+        self.logger.info(f"Generated total of {len(chunks)} embeddings for legislation: {legislation_id}")
 
     def generate_embeddings(
         self, legislation_data: Dict[str, Any], chunk_size: int = 200
@@ -164,92 +206,55 @@ class EmbeddingsGenerator:
         """
         Generate embeddings for the given legislation data.
         """
-        legislation_id = legislation_data.get("id", "unknown_id")
-        self.logger.info(f"Starting embedding generation for legislation: {legislation_id}")
-        
-        if "content" not in legislation_data:
-            self.logger.error(f"Missing content in legislation data: {legislation_id}")
-            return legislation_data
-
-        try:
-            legislation_data["embeddings"] = []
-            point_id_counter = 0  # Initialize counter here before use
-            
-            # Log the content structure
-            content_count = len(legislation_data["content"])
-            self.logger.info(f"Found {content_count} content sections in legislation: {legislation_id}")
-            
-            for section_idx, section in enumerate(legislation_data["content"]):
-                section_text = section.get("text", "")
-                if not section_text:
-                    self.logger.warning(f"Empty text in section {section_idx} for legislation: {legislation_id}")
-                    continue
-                    
-                # Log section text length for debugging
-                self.logger.debug(f"Section {section_idx} has {len(section_text)} characters")
-
-                text_chunks = self._split_text_into_chunks(section_text, chunk_size)
-                self.logger.debug(f"Split section {section_idx} into {len(text_chunks)} chunks")
-                
-                chunk_embeddings = self._generate_chunk_embeddings(text_chunks)
-                self.logger.debug(f"Generated {len(chunk_embeddings)} embeddings for section {section_idx}")
-
-                for chunk_idx, (chunk, embedding) in enumerate(zip(text_chunks, chunk_embeddings)):
-                    # Use simple integer IDs
-                    point_id = point_id_counter
-                    point_id_counter += 1
-
-                    # Keep section/chunk information as metadata
-                    embedding_data = {
-                        "section_idx": section_idx,
-                        "section_type": section.get("section_type", ""),
-                        "section_number": section.get("section_number", ""),
-                        "section_title": section.get("section_title", ""),
-                        "chunk_idx": chunk_idx,
-                        "text": chunk,
-                        "vector": embedding.tolist(),
-                        "point_id": point_id,  # Use numeric point_id
-                        # Add metadata for search/filtering if needed
-                        "metadata": {
-                            "legislation_id": legislation_id,
-                            "section_idx": section_idx,
-                            "chunk_idx": chunk_idx
-                        }
-                    }
-                    legislation_data["embeddings"].append(embedding_data)
-                    
-            embedding_count = len(legislation_data["embeddings"])
-            self.logger.info(f"Generated total of {embedding_count} embeddings for legislation: {legislation_id}")
-            
-            return legislation_data
-
-        except Exception as e:
-            self.logger.error(f"Error generating embeddings for {legislation_id}: {str(e)}")
-            import traceback
-            self.logger.error(traceback.format_exc())
-            return legislation_data
+        self.batch_process_legislation([legislation_data], chunk_size=chunk_size)
+        return legislation_data
 
     def generate_query_embedding(self, query: str) -> np.ndarray:
         try:
-            with torch.no_grad():
-                query_embedding = self.model.encode(query, convert_to_numpy=True)
-
-            norm = np.linalg.norm(query_embedding, keepdims=True)
-            query_embedding = query_embedding / max(norm, 1e-10)
-
-            return query_embedding
+            return self._encode([query], self.batch_size)[0]
 
         except Exception as e:
             self.logger.error(f"Error generating query embedding: {str(e)}")
             return np.zeros(self.model.get_sentence_embedding_dimension())
 
     def batch_process_legislation(
-        self, legislation_list: List[Dict[str, Any]]
+        self, legislation_list: List[Dict[str, Any]], chunk_size: int = 200
     ) -> List[Dict[str, Any]]:
-        processed_docs: List[Dict[str, Any]] = []
+        """
+        Generate embeddings for several documents with one bulk pass over all their chunks.
+
+        Chunks from every document are embedded together in large batches and the
+        vectors are then scattered back to their documents.
+
+        Args:
+            legislation_list: Legislation documents with cleaned content
+            chunk_size: Maximum words per chunk
+
+        Returns:
+            The same documents, each with an "embeddings" list
+        """
+        documents = []
+        all_texts: List[str] = []
+        for legislation_data in legislation_list:
+            legislation_id = legislation_data.get("id", "unknown_id")
+            self.logger.info(f"Starting embedding generation for legislation: {legislation_id}")
+            if "content" not in legislation_data:
+                self.logger.error(f"Missing content in legislation data: {legislation_id}")
+                continue
+
+            chunks = self._chunk_sections(legislation_data, chunk_size)
+            documents.append((legislation_data, chunks, len(all_texts)))
+            all_texts.extend(chunk for _, _, _, chunk in chunks)
+
+        try:
+            vectors = self.generate_embeddings_bulk(all_texts)
+        except Exception as e:
+            self.logger.error(f"Error generating embeddings for {len(documents)} legislation documents: {str(e)}")
+            import traceback
+            self.logger.error(traceback.format_exc())
+            return legislation_list
 
-        for doc in legislation_list:
-            processed_doc = self.generate_embeddings(doc)
-            processed_docs.append(processed_doc)
+        for legislation_data, chunks, start in documents:
+            self._attach_embeddings(legislation_data, chunks, vectors[start : start + len(chunks)])
 
-        return processed_docs
+        return legislation_list